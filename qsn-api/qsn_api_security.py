@@ -4,25 +4,69 @@ API Security with Quantum Authentication and Threat Detection
 Level 1000 Architecture
 """
 
+import base64
+import binascii
 import json
 import hashlib
 import hmac
+import secrets
+import threading
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
-import jwt
+from typing import Dict, Iterable, List, Optional, Union
 import sys
 sys.path.insert(0, 'J:\\oroboros-core\\QUANTUM_SECURITY_NETWORK\\qsn-core')
 from qsn_quantum_core import QSNQuantumCore
+from qsn_rate_limiter import RateLimiter, SharedMemoryRateLimiter
 
 class QSN_API_Security:
-    """Quantum API Security with Advanced Authentication"""
+    """Quantum API Security with Advanced Authentication
     
-    def __init__(self, quantum_core: QSNQuantumCore):
+    Pass a SharedMemoryRateLimiter created before forking to make every
+    worker process on the host enforce one shared per-key budget, or a
+    started ClusterRateLimiter (qsn_cluster_sync) to share it across nodes.
+    """
+    
+    # Sustained requests per minute and burst allowance per security level
+    RATE_LIMITS = {
+        65: {'requests_per_minute': 60, 'burst': 10},
+        99: {'requests_per_minute': 600, 'burst': 100},
+        100: {'requests_per_minute': 6000, 'burst': 1000},
+        1000: {'requests_per_minute': 60000, 'burst': 10000}
+    }
+    
+    # base64url of the fixed HS256 JWT header, as PyJWT serializes it
+    JWT_HEADER = base64.urlsafe_b64encode(b'{"alg":"HS256","typ":"JWT"}').rstrip(b'=')
+    TOKEN_LIFETIME = timedelta(hours=1)
+    
+    def __init__(self, quantum_core: QSNQuantumCore,
+                 rate_limiter: Optional[Union[RateLimiter, SharedMemoryRateLimiter]] = None,
+                 verified_cache_size: int = 10000,
+                 signing_secrets: Optional[Dict[int, Union[str, bytes]]] = None):
         self.quantum_core = quantum_core
         self.api_keys = {}
-        self.rate_limits = {}
+        self.rate_limiter = rate_limiter if rate_limiter is not None else RateLimiter()
         self.threat_detection = ThreatDetection()
         
+        # (limit, emission interval in seconds, burst) per level, so checks do no arithmetic setup
+        self._rate_params = {
+            level: (limit['requests_per_minute'], 60 / limit['requests_per_minute'], limit['burst'])
+            for level, limit in self.RATE_LIMITS.items()
+        }
+        
+        # Keyed HMAC-SHA256 state per level, already fed the JWT header; tokens .copy() it.
+        # Levels without a configured secret sign with a public placeholder and never verify
+        self._signing_secrets: Dict[int, bytes] = {
+            level: self._checked_secret(level, secret) for level, secret in (signing_secrets or {}).items()
+        }
+        self._signers = {level: self._build_signer(self._signing_secret(level)) for level in self.RATE_LIMITS}
+        
+        # LRU of verified token digests -> (expiry timestamp, claims, key generation)
+        self.verified_cache_size = verified_cache_size
+        self._verified: OrderedDict = OrderedDict()
+        self._verified_lock = threading.Lock()
+        self._key_generation = 0
+        
         # API security configuration
         self.security_config = {
             'quantum_auth': True,
@@ -43,6 +87,14 @@ class QSN_API_Security:
                 'threat_level': 'HIGH'
             }
         
+        # Tokens are only signed for the configured security levels
+        if security_level not in self.RATE_LIMITS:
+            return {
+                'authenticated': False,
+                'reason': 'Invalid security level',
+                'threat_level': 'HIGH'
+            }
+        
         # Quantum signature verification
         quantum_sig_valid = self._verify_quantum_signature(request_data, security_level)
         if not quantum_sig_valid['valid']:
@@ -72,13 +124,13 @@ class QSN_API_Security:
             }
         
         # Generate quantum token
-        quantum_token = self._generate_quantum_token(api_key, security_level)
+        issued = self.issue_quantum_token(api_key, security_level)
         
         return {
             'authenticated': True,
-            'quantum_token': quantum_token,
+            'quantum_token': issued['quantum_token'],
             'security_level': security_level,
-            'expires_at': (datetime.now() + timedelta(hours=1)).isoformat(),
+            'expires_at': issued['expires_at'],
             'threat_level': 'LOW'
         }
     
@@ -193,57 +245,182 @@ class QSN_API_Security:
         return len(data) > 0
     
     def _check_rate_limit(self, api_key: str, security_level: int) -> Dict:
-        """Check rate limiting based on security level"""
-        
-        rate_limits = {
-            65: {'requests_per_minute': 60, 'burst': 10},
-            99: {'requests_per_minute': 600, 'burst': 100},
-            100: {'requests_per_minute': 6000, 'burst': 1000},
-            1000: {'requests_per_minute': 60000, 'burst': 10000}
-        }
-        
-        limit = rate_limits.get(security_level, rate_limits[65])
-        
-        # Simple rate limiting implementation
-        current_minute = datetime.now().strftime("%Y-%m-%d %H:%M")
-        key = f"{api_key}:{current_minute}"
+        """Check rate limiting based on security level
         
-        if key not in self.rate_limits:
-            self.rate_limits[key] = 0
-        
-        self.rate_limits[key] += 1
-        
-        allowed = self.rate_limits[key] <= limit['requests_per_minute']
+        Sustained rate is ``requests_per_minute``; at most ``burst``
+        requests are admitted back to back. ``current_count`` is the number
+        of requests currently held against the burst allowance.
+        """
+        limit, interval, burst = self._rate_params.get(security_level) or self._rate_params[65]
+        allowed, current_count = self.rate_limiter.acquire(api_key, interval, burst)
         
         return {
             'allowed': allowed,
-            'current_count': self.rate_limits[key],
-            'limit': limit['requests_per_minute'],
-            'burst_limit': limit['burst']
+            'current_count': current_count,
+            'limit': limit,
+            'burst_limit': burst
         }
     
     def _generate_quantum_token(self, api_key: str, security_level: int) -> str:
         """Generate quantum authentication token"""
-        
-        payload = {
-            'api_key': api_key,
-            'security_level': security_level,
-            'issued_at': datetime.now().isoformat(),
-            'expires_at': (datetime.now() + timedelta(hours=1)).isoformat(),
-            'quantum_verified': True
+        return self.issue_quantum_token(api_key, security_level)['quantum_token']
+    
+    def issue_quantum_token(self, api_key: str, security_level: int, include_encoding: bool = False) -> Dict:
+        """Issue an HS256 JWT for ``api_key``
+        
+        The quantum encoding of the token claims is only computed when
+        ``include_encoding`` is set, and is returned as ``quantum_encoded``.
+        """
+        issued_at = datetime.now()
+        claims_json = '{"api_key":' + json.dumps(api_key) + self._claims_suffix(security_level, issued_at)
+        
+        result = {
+            'quantum_token': self._sign_claims(claims_json, security_level),
+            'expires_at': (issued_at + self.TOKEN_LIFETIME).isoformat()
         }
         
-        # Use quantum core for token generation
-        encoded_payload = self.quantum_core.metatrons_cube_encoding(
-            json.dumps(payload), 
-            security_level
-        )
+        if include_encoding:
+            claims = json.loads(claims_json)
+            result['quantum_encoded'] = self.quantum_core.metatrons_cube_encoding(json.dumps(claims), security_level)
         
-        # Create JWT token
-        secret = f"quantum_secret_{security_level}"
-        token = jwt.encode(payload, secret, algorithm='HS256')
+        return result
+    
+    def issue_tokens_batch(self, api_keys: Iterable[str], security_level: int) -> List[str]:
+        """Issue one token per API key, all sharing a single issued_at/expires_at
+        
+        The claims around the API key are serialized once for the batch, so
+        each token costs one JSON string escape and one HMAC.
+        """
+        claims_suffix = self._claims_suffix(security_level, datetime.now())
+        return [
+            self._sign_claims('{"api_key":' + json.dumps(api_key) + claims_suffix, security_level)
+            for api_key in api_keys
+        ]
+    
+    def _claims_suffix(self, security_level: int, issued_at: datetime) -> str:
+        """Token claims JSON after the api_key value
+        
+        Together with the ``{"api_key":...`` head this is byte-for-byte
+        what PyJWT produced for the claims dict tokens have always carried.
+        """
+        return (
+            f',"security_level":{json.dumps(security_level)},'
+            f'"issued_at":"{issued_at.isoformat()}",'
+            f'"expires_at":"{(issued_at + self.TOKEN_LIFETIME).isoformat()}",'
+            f'"quantum_verified":true}}'
+        )
+    
+    def _sign_claims(self, claims_json: str, security_level: int) -> str:
+        """Assemble ``header.claims.signature`` from the level's precomputed HMAC state"""
+        signer = self._signers.get(security_level)
+        if signer is None:
+            raise ValueError(f"Unknown security level: {security_level}")
+        
+        claims = base64.urlsafe_b64encode(claims_json.encode()).rstrip(b'=')
+        mac = signer.copy()
+        mac.update(claims)
+        signature = base64.urlsafe_b64encode(mac.digest()).rstrip(b'=')
+        
+        return b'.'.join((self.JWT_HEADER, claims, signature)).decode('ascii')
+    
+    def _build_signer(self, secret: bytes) -> 'hmac.HMAC':
+        """HMAC-SHA256 keyed with a level secret, already fed ``header.``"""
+        signer = hmac.new(secret, digestmod=hashlib.sha256)
+        signer.update(self.JWT_HEADER + b'.')
+        return signer
+    
+    def _signing_secret(self, security_level: int) -> bytes:
+        """The level's configured secret, else the placeholder published in this source"""
+        secret = self._signing_secrets.get(security_level)
+        return secret if secret is not None else f"quantum_secret_{security_level}".encode()
+    
+    def _checked_secret(self, security_level: int, secret: Union[str, bytes]) -> bytes:
+        if isinstance(secret, str):
+            secret = secret.encode()
+        if security_level not in self.RATE_LIMITS:
+            raise ValueError(f"Unknown security level: {security_level}")
+        if not secret:
+            raise ValueError("Signing secret must not be empty")
+        return secret
+    
+    def rotate_signing_secret(self, security_level: int, secret: Union[str, bytes]) -> None:
+        """Replace (or first configure) a level's signing secret
+        
+        Tokens signed with the old secret stop verifying immediately. The
+        new signer is installed before the level counts as configured and
+        before the key generation is bumped, so no verification that could
+        have used the old secret is ever served from the cache: anything
+        cached before the bump is cleared, and a verify still in flight
+        across it is refused a cache slot.
+        """
+        secret = self._checked_secret(security_level, secret)
+        
+        self._signers[security_level] = self._build_signer(secret)
+        self._signing_secrets[security_level] = secret
+        with self._verified_lock:
+            self._key_generation += 1
+            self._verified.clear()
+    
+    def verify_quantum_token(self, token: str) -> Dict:
+        """Verify a token's HS256 signature against its level's secret and its expiry
+        
+        Returns ``{'valid': True, 'claims': ...}`` or ``{'valid': False,
+        'reason': ..., 'threat_level': ...}``. Tokens that verified before
+        are answered from a bounded LRU of token digests, which still
+        enforces their expiry but skips parsing and the HMAC. Only levels
+        given a secret (``signing_secrets`` or rotate_signing_secret) verify.
+        """
+        digest = hashlib.blake2b(token.encode(), digest_size=16).digest()
+        now = datetime.now().timestamp()
+        
+        with self._verified_lock:
+            generation = self._key_generation
+            cached = self._verified.get(digest)
+            if cached is not None:
+                expires, claims, cached_generation = cached
+                if cached_generation == generation and expires > now:
+                    self._verified.move_to_end(digest)
+                    return {'valid': True, 'claims': dict(claims)}
+                del self._verified[digest]
+                if cached_generation == generation:
+                    return {'valid': False, 'reason': 'Token expired', 'threat_level': 'MEDIUM'}
         
-        return token
+        try:
+            header, claims_segment, signature = token.encode('ascii').split(b'.')
+            claims = json.loads(base64.urlsafe_b64decode(claims_segment + b'=' * (-len(claims_segment) % 4)))
+            security_level = claims['security_level']
+            expires = datetime.fromisoformat(claims['expires_at']).timestamp()
+        except (ValueError, KeyError, TypeError, binascii.Error):
+            return {'valid': False, 'reason': 'Malformed token', 'threat_level': 'HIGH'}
+        
+        # Only the fixed HS256 header is accepted, so alg cannot be downgraded
+        if header != self.JWT_HEADER or not isinstance(security_level, int):
+            return {'valid': False, 'reason': 'Malformed token', 'threat_level': 'HIGH'}
+        
+        # Only configured levels have a signer; never fall back to a default secret
+        signer = self._signers.get(security_level)
+        if signer is None:
+            return {'valid': False, 'reason': 'Invalid signature', 'threat_level': 'HIGH'}
+        
+        # Anyone can sign with the placeholder secrets, so they never verify
+        if security_level not in self._signing_secrets:
+            return {'valid': False, 'reason': 'Signing secret not configured', 'threat_level': 'HIGH'}
+        mac = signer.copy()
+        mac.update(claims_segment)
+        expected = base64.urlsafe_b64encode(mac.digest()).rstrip(b'=')
+        
+        if not hmac.compare_digest(signature, expected):
+            return {'valid': False, 'reason': 'Invalid signature', 'threat_level': 'HIGH'}
+        if expires <= now:
+            return {'valid': False, 'reason': 'Token expired', 'threat_level': 'MEDIUM'}
+        
+        with self._verified_lock:
+            if generation == self._key_generation:
+                self._verified[digest] = (expires, claims, generation)
+                if len(self._verified) > self.verified_cache_size:
+                    self._verified.popitem(last=False)
+        
+        return {'valid': True, 'claims': dict(claims)}
     
     def register_api_key(self, key_data: Dict) -> Dict:
         """Register new API key"""
@@ -336,8 +513,11 @@ if __name__ == "__main__":
     # Initialize QSN core
     qsn_core = QSNQuantumCore()
     
-    # Initialize API security
-    qsn_api = QSN_API_Security(qsn_core)
+    # Initialize API security with a signing secret per level
+    qsn_api = QSN_API_Security(
+        qsn_core,
+        signing_secrets={level: secrets.token_bytes(32) for level in QSN_API_Security.RATE_LIMITS}
+    )
     
     # Register API key
     key_data = {
@@ -350,6 +530,11 @@ if __name__ == "__main__":
     print("API Key Registration:")
     print(json.dumps(registration, indent=2))
     
+    # Issue and verify a token
+    token = qsn_api.issue_quantum_token(key_data['api_key'], 99)['quantum_token']
+    print("\nToken Verification:")
+    print(json.dumps(qsn_api.verify_quantum_token(token), indent=2))
+    
     # Test authentication
     request_data = {
         'quantum_signature': 'test_signature',
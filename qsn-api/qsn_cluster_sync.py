@@ -0,0 +1,337 @@
+"""
+QSN-API: Cluster Rate Limit Synchronization
+Nodes exchange per-key usage deltas over UDP so their limiters converge on a global budget
+"""
+
+import hashlib
+import hmac
+import multiprocessing
+import os
+import socket
+import struct
+import threading
+import time
+from math import ceil
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+from qsn_rate_limiter import RateLimiter
+
+
+class ClusterRateLimiter(RateLimiter):
+    """RateLimiter whose admitted requests are also charged on every peer node
+
+    Every admitted request adds ``interval`` seconds of debt for its key to
+    an outgoing buffer. A background thread sends the buffered deltas to
+    the peers every ``sync_interval`` seconds and merges the deltas it
+    receives into a table of remote TATs. The next local check of a key
+    takes that key's remote TAT with ``dict.pop`` and adds the outstanding
+    remote debt to the local bucket, so the check path stays lock-free.
+
+    Only the sync thread writes the remote table and it also takes
+    entries with ``pop``, so a merge and a check never lose or double a
+    delta. The outgoing buffers are double-buffered: a buffer is sent one
+    sync tick after it was swapped out, which gives checks that were
+    still writing to it a full tick to finish. Nodes overshoot the global
+    budget by at most what the cluster admits within about two sync
+    intervals, since that is how long a delta takes to reach every peer.
+
+    Peers share a cluster ``secret``: every datagram carries a truncated
+    HMAC-SHA256 tag over its contents, including a per-sender sequence
+    number that starts from the sender's wall clock in nanoseconds so it
+    keeps increasing across restarts. Datagrams from an address outside
+    ``peers``, with a bad tag, or with a sequence number no newer than the
+    last one accepted from that peer are dropped, so a captured datagram
+    cannot be replayed to charge a key twice. A datagram overtaken by a
+    later one from the same peer is dropped too, like a lost one.
+    """
+
+    MAGIC = b'QSNR'
+    HEADER = struct.Struct('<4sQH')     # magic, sender sequence number, entry count
+    ENTRY = struct.Struct('<Hf')        # key length, debt seconds (key bytes follow the length)
+    TAG_SIZE = 16                       # truncated HMAC-SHA256 appended to every datagram
+    MAX_DATAGRAM = 1400
+
+    def __init__(self, bind: Tuple[str, int], peers: Sequence[Tuple[str, int]], secret: bytes,
+                 sync_interval: float = 0.05, sweep_interval: float = 60.0):
+        super().__init__(sweep_interval)
+        if sync_interval <= 0:
+            raise ValueError(f"Invalid sync interval: {sync_interval}")
+        if not secret:
+            raise ValueError("A shared cluster secret is required")
+
+        # Datagrams arrive from resolved addresses, so compare against those
+        self.peers = [(socket.gethostbyname(host), port) for host, port in peers]
+        self._peer_set = frozenset(self.peers)
+        self._secret = secret
+        self.sync_interval = sync_interval
+
+        self._pending: Dict[str, float] = {}
+        self._swapped: Dict[str, float] = {}
+        self._remote: Dict[str, float] = {}
+        self._sequence = time.time_ns()
+        self._last_sequence: Dict[Tuple[str, int], int] = {}
+
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._socket.bind(bind)
+        self.address = self._socket.getsockname()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.datagrams_sent = 0
+        self.datagrams_received = 0
+        self.datagrams_rejected = 0
+        self.bytes_sent = 0
+        self.send_errors = 0
+        self.receive_errors = 0
+
+    def acquire(self, key: Hashable, interval: float, burst: int) -> Tuple[bool, int]:
+        now = self._clock()
+        if now >= self._next_sweep:
+            self._sweep(now)
+
+        tats = self._tats
+        tat = tats.get(key, now)
+        if tat < now:
+            tat = now
+
+        remote_tat = self._remote.pop(key, None)
+        if remote_tat is not None and remote_tat > now:
+            tat += remote_tat - now
+
+        new_tat = tat + interval
+        if new_tat - now > burst * interval:
+            if remote_tat is not None:
+                tats[key] = tat  # Keep the folded remote debt
+            return False, ceil((tat - now) / interval)
+
+        tats[key] = new_tat
+        pending = self._pending
+        pending[key] = pending.get(key, 0.0) + interval
+        return True, ceil((new_tat - now) / interval)
+
+    def start(self) -> 'ClusterRateLimiter':
+        """Start the background sync thread"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='qsn-rate-sync', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Flush outstanding deltas, stop the sync thread and close the socket"""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._socket.close()
+
+    def __enter__(self) -> 'ClusterRateLimiter':
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def _run(self) -> None:
+        next_tick = time.monotonic() + self.sync_interval
+
+        while not self._stopped.is_set():
+            timeout = next_tick - time.monotonic()
+            if timeout <= 0:
+                self._flush()
+                next_tick += self.sync_interval
+                continue
+
+            try:
+                self._socket.settimeout(timeout)
+                datagram, source = self._socket.recvfrom(65535)
+            except socket.timeout:
+                continue
+            except ConnectionResetError:
+                # Windows reports an earlier send to a peer that is down on the next receive
+                self.receive_errors += 1
+                continue
+            except OSError:
+                self.receive_errors += 1
+                self._stopped.wait(timeout)  # Do not spin on a persistent error
+                continue
+            self._merge(datagram, source)
+
+        self._flush()
+        self._flush()
+
+    def _flush(self) -> None:
+        """Send the previously swapped-out deltas and swap out the current ones"""
+        outgoing = self._swapped
+        self._swapped = self._pending
+        self._pending = {}
+
+        if outgoing and self.peers:
+            datagrams = self.pack(outgoing, self._sequence, self.MAX_DATAGRAM - self.TAG_SIZE)
+            self._sequence += len(datagrams)
+            for datagram in datagrams:
+                datagram += self._tag(datagram)
+                for peer in self.peers:
+                    try:
+                        self._socket.sendto(datagram, peer)
+                    except OSError:
+                        self.send_errors += 1  # Unreachable peers lose this delta, not the sync thread
+                        continue
+                    self.datagrams_sent += 1
+                    self.bytes_sent += len(datagram)
+
+        # Remote debt that has already been paid off no longer matters
+        now = self._clock()
+        for key, remote_tat in list(self._remote.items()):
+            if remote_tat <= now:
+                self._remote.pop(key, None)
+
+    def _tag(self, body: bytes) -> bytes:
+        return hmac.new(self._secret, body, hashlib.sha256).digest()[:self.TAG_SIZE]
+
+    def _merge(self, datagram: bytes, source: Tuple[str, int]) -> None:
+        """Fold one authenticated peer datagram into the remote TAT table"""
+        body, tag = datagram[:-self.TAG_SIZE], datagram[-self.TAG_SIZE:]
+        if source not in self._peer_set or len(datagram) <= self.TAG_SIZE \
+                or not hmac.compare_digest(tag, self._tag(body)):
+            self.datagrams_rejected += 1
+            return
+
+        try:
+            sequence, deltas = self.unpack(body)
+        except (ValueError, struct.error, UnicodeDecodeError):
+            self.datagrams_rejected += 1
+            return  # Authenticated but malformed
+
+        if sequence <= self._last_sequence.get(source, -1):
+            self.datagrams_rejected += 1
+            return  # Replayed, or overtaken by a newer datagram
+        self._last_sequence[source] = sequence
+
+        self.datagrams_received += 1
+        now = self._clock()
+        remote = self._remote
+        for key, debt in deltas:
+            remote_tat = remote.pop(key, now)
+            remote[key] = max(remote_tat, now) + debt
+
+    @classmethod
+    def pack(cls, deltas: Dict[str, float], sequence: int = 0, max_size: Optional[int] = None) -> List[bytes]:
+        """Encode per-key debts into datagrams of at most ``max_size`` (MAX_DATAGRAM) bytes
+
+        The datagrams are numbered ``sequence``, ``sequence + 1``, ...
+        """
+        max_size = max_size or cls.MAX_DATAGRAM
+        datagrams = []
+        entries: List[bytes] = []
+        size = cls.HEADER.size
+
+        for key, debt in deltas.items():
+            encoded_key = str(key).encode('utf-8')
+            entry = cls.ENTRY.pack(len(encoded_key), debt) + encoded_key
+            if entries and size + len(entry) > max_size:
+                datagrams.append(cls.HEADER.pack(cls.MAGIC, sequence + len(datagrams), len(entries)) + b''.join(entries))
+                entries, size = [], cls.HEADER.size
+            entries.append(entry)
+            size += len(entry)
+
+        if entries:
+            datagrams.append(cls.HEADER.pack(cls.MAGIC, sequence + len(datagrams), len(entries)) + b''.join(entries))
+        return datagrams
+
+    @classmethod
+    def unpack(cls, datagram: bytes) -> Tuple[int, List[Tuple[str, float]]]:
+        """Sequence number and per-key debts of one datagram body"""
+        magic, sequence, count = cls.HEADER.unpack_from(datagram)
+        if magic != cls.MAGIC:
+            raise ValueError("Not a rate sync datagram")
+
+        deltas = []
+        offset = cls.HEADER.size
+        for _ in range(count):
+            key_length, debt = cls.ENTRY.unpack_from(datagram, offset)
+            offset += cls.ENTRY.size
+            deltas.append((datagram[offset:offset + key_length].decode('utf-8'), debt))
+            offset += key_length
+
+        return sequence, deltas
+
+    def stats(self) -> Dict:
+        return {
+            'keys': len(self._tats),
+            'remote_keys': len(self._remote),
+            'datagrams_sent': self.datagrams_sent,
+            'datagrams_received': self.datagrams_received,
+            'datagrams_rejected': self.datagrams_rejected,
+            'bytes_sent': self.bytes_sent,
+            'send_errors': self.send_errors,
+            'receive_errors': self.receive_errors
+        }
+
+
+def _drift_node(port: int, peer_ports: Sequence[int], secret: bytes, requests_per_minute: int, burst: int,
+                start_at: float, duration: float, sync_interval: float, results) -> None:
+    """One localhost node of measure_drift: hammer a single key until the window closes"""
+    peers = [('127.0.0.1', peer) for peer in peer_ports]
+    interval = 60 / requests_per_minute
+    admitted = attempts = 0
+
+    with ClusterRateLimiter(('127.0.0.1', port), peers, secret, sync_interval) as limiter:
+        while time.monotonic() < start_at:
+            time.sleep(0.001)
+        while time.monotonic() < start_at + duration:
+            admitted += limiter.acquire("client", interval, burst)[0]
+            attempts += 1
+            if attempts % 64 == 0:
+                time.sleep(0)  # Let the sync thread run
+        stats = limiter.stats()
+
+    results.put({'port': port, 'admitted': admitted, 'attempts': attempts, **stats})
+
+
+def measure_drift(nodes: int = 3, requests_per_minute: int = 6000, burst: int = 100, duration: float = 3.0,
+                  sync_interval: float = 0.05, base_port: int = 47300, sync: bool = True) -> Dict:
+    """Run ``nodes`` limiter processes on localhost against one key and compare to the exact budget
+
+    A single exact limiter would admit ``burst + duration * rate`` requests
+    over the window; ``drift`` is how far the cluster's total admissions
+    are from that, as a fraction. With ``sync=False`` the nodes do not
+    know about each other, which shows the unsynchronized N-times drift.
+    """
+    ports = [base_port + node for node in range(nodes)]
+    secret = os.urandom(32)
+    results = multiprocessing.Queue()
+    start_at = time.monotonic() + 1.0
+
+    workers = [
+        multiprocessing.Process(target=_drift_node, args=(
+            port, [peer for peer in ports if peer != port] if sync else [], secret,
+            requests_per_minute, burst, start_at, duration, sync_interval, results
+        ))
+        for port in ports
+    ]
+    for worker in workers:
+        worker.start()
+    node_results = sorted((results.get() for _ in workers), key=lambda result: result['port'])
+    for worker in workers:
+        worker.join()
+
+    admitted = sum(result['admitted'] for result in node_results)
+    exact = burst + duration * requests_per_minute / 60
+
+    return {
+        'nodes': nodes,
+        'sync': sync,
+        'sync_interval': sync_interval,
+        'duration': duration,
+        'exact_budget': exact,
+        'admitted': admitted,
+        'drift': (admitted - exact) / exact,
+        'node_results': node_results
+    }
+
+
+# Example usage
+if __name__ == "__main__":
+    for sync in (False, True):
+        report = measure_drift(sync=sync)
+        print(f"sync={sync}: {report['nodes']} nodes admitted {report['admitted']} "
+              f"vs exact {report['exact_budget']:.0f} (drift {report['drift']:+.1%})")
@@ -0,0 +1,339 @@
+"""
+QSN-API: Rate Limiting
+GCRA token-bucket limiters with one float of state per key
+"""
+
+import hashlib
+import multiprocessing
+import os
+import threading
+import time
+from functools import lru_cache
+from math import ceil
+from multiprocessing.shared_memory import SharedMemory
+from typing import Callable, Dict, Hashable, Tuple
+
+
+class RateLimiter:
+    """Generic cell rate algorithm (GCRA) limiter
+
+    Each key stores only its theoretical arrival time (TAT): the instant
+    its bucket would be full again. A request costs ``interval`` seconds
+    of TAT and is refused when that would put the TAT more than
+    ``burst * interval`` ahead of now, which admits bursts of up to
+    ``burst`` requests on top of a sustained one per ``interval``.
+
+    A key whose TAT has passed holds a full bucket and behaves exactly
+    like an unknown key, so such idle keys are dropped by a sweep every
+    ``sweep_interval`` seconds. Memory therefore tracks the keys active
+    within the last burst window, not the lifetime of the process.
+
+    Checks take no lock: every dict operation is atomic, so concurrent
+    threads can never corrupt the table. Two checks racing on the same key
+    can each read the same TAT, in which case both may be admitted; that
+    over-admits by at most one request per race, which is the price of a
+    check that costs a dict lookup and a store. Sweeps are serialized.
+    """
+
+    def __init__(self, sweep_interval: float = 60.0, clock: Callable[[], float] = time.monotonic):
+        if sweep_interval <= 0:
+            raise ValueError(f"Invalid sweep interval: {sweep_interval}")
+
+        self.sweep_interval = sweep_interval
+        self._clock = clock
+        self._tats: Dict[Hashable, float] = {}
+        self._lock = threading.Lock()
+        self._next_sweep = clock() + sweep_interval
+
+        self.evicted = 0
+
+    def acquire(self, key: Hashable, interval: float, burst: int) -> Tuple[bool, int]:
+        """Take one request from ``key``'s bucket
+
+        Returns ``(allowed, used)`` where ``used`` is the number of
+        requests currently counted against the burst allowance.
+        """
+        now = self._clock()
+        if now >= self._next_sweep:
+            self._sweep(now)
+
+        tats = self._tats
+        tat = tats.get(key, now)
+        if tat < now:
+            tat = now
+
+        new_tat = tat + interval
+        if new_tat - now > burst * interval:
+            return False, ceil((tat - now) / interval)
+
+        tats[key] = new_tat
+        return True, ceil((new_tat - now) / interval)
+
+    def retry_after(self, key: Hashable, interval: float, burst: int) -> float:
+        """Seconds until ``key`` may make its next request (0 if it may now)"""
+        now = self._clock()
+        tat = self._tats.get(key, now)
+        return max(0.0, tat + interval - burst * interval - now)
+
+    def _sweep(self, now: float) -> None:
+        """Drop keys whose bucket has refilled
+
+        The table is copied and swapped rather than edited in place, so
+        concurrent checks never iterate a dict that is changing size.
+        """
+        if not self._lock.acquire(blocking=False):
+            return  # Another thread is already sweeping
+
+        try:
+            if now < self._next_sweep:
+                return
+            self._next_sweep = now + self.sweep_interval
+
+            tats = self._tats
+            live = {key: tat for key, tat in list(tats.items()) if tat > now}
+            self._tats = live
+            self.evicted += len(tats) - len(live)
+        finally:
+            self._lock.release()
+
+    def reset(self, key: Hashable) -> None:
+        self._tats.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._tats)
+
+
+@lru_cache(maxsize=1 << 16)
+def _fingerprint(key: Hashable) -> int:
+    """Process-independent, non-zero 64-bit fingerprint of a key"""
+    data = key if isinstance(key, bytes) else str(key).encode('utf-8')
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'little') or 1
+
+
+class SharedMemoryRateLimiter:
+    """GCRA limiter whose table lives in shared memory, for worker processes on one host
+
+    Create it once in the parent and hand it to the workers (as a Process
+    argument or pool initializer argument); every worker then draws from
+    the same per-key budget. The table is ``capacity`` slots of a 64-bit
+    key fingerprint and a float64 TAT, split into ``stripes`` sub-tables
+    that each have their own lock. Within a stripe, keys are placed by
+    linear probing; slots whose TAT has passed are reused for new keys,
+    and a stripe that fills past ``max_load`` is compacted in place.
+
+    If a stripe is completely full of active keys, a new key is admitted
+    and counted in ``overflows``, which totals every process, rather than
+    refused. The clock must be system-wide; ``time.monotonic`` is. Pass the multiprocessing
+    ``context`` the workers will be started from if it is not the default.
+    """
+
+    def __init__(self, capacity: int = 1 << 16, stripes: int = 64, max_load: float = 0.75, context=None):
+        if stripes <= 0 or capacity < stripes:
+            raise ValueError(f"Invalid table shape: {capacity} slots in {stripes} stripes")
+        if not 0 < max_load <= 1:
+            raise ValueError(f"Invalid load factor: {max_load}")
+
+        self.stripes = stripes
+        self.slots = capacity // stripes
+        self.capacity = self.slots * stripes
+        self.max_load = max_load
+
+        # Fingerprints, then TATs, then per-stripe occupied-slot and overflow counts
+        self._shm = SharedMemory(create=True, size=16 * self.capacity + 16 * stripes)
+        self._shm.buf[:] = bytes(len(self._shm.buf))
+        context = context or multiprocessing.get_context()
+        self._locks = [context.Lock() for _ in range(stripes)]
+        self._owner_pid = os.getpid()
+        self._attach()
+
+    def _attach(self) -> None:
+        buf = self._shm.buf
+        self._hashes = buf[:8 * self.capacity].cast('Q')
+        self._tats = buf[8 * self.capacity:16 * self.capacity].cast('d')
+        self._used = buf[16 * self.capacity:16 * self.capacity + 8 * self.stripes].cast('q')
+        self._overflows = buf[16 * self.capacity + 8 * self.stripes:16 * self.capacity + 16 * self.stripes].cast('q')
+        self._max_used = max(1, int(self.slots * self.max_load))
+        self._clock = time.monotonic
+
+    @property
+    def overflows(self) -> int:
+        """New keys admitted unlimited because their stripe was full, across all processes"""
+        return sum(self._overflows)
+
+    def __getstate__(self) -> Dict:
+        return {
+            'name': self._shm.name,
+            'stripes': self.stripes,
+            'slots': self.slots,
+            'capacity': self.capacity,
+            'max_load': self.max_load,
+            'locks': self._locks
+        }
+
+    def __setstate__(self, state: Dict) -> None:
+        self.stripes = state['stripes']
+        self.slots = state['slots']
+        self.capacity = state['capacity']
+        self.max_load = state['max_load']
+        self._locks = state['locks']
+        self._shm = SharedMemory(name=state['name'])
+        self._owner_pid = None
+        self._attach()
+
+    def _find(self, stripe: int, fingerprint: int, now: float) -> int:
+        """Slot holding ``fingerprint``, else a free or expired slot for it (-1 if none)
+
+        Called with the stripe lock held. Returning a free slot does not
+        claim it; the caller counts it in ``_used`` only if it writes there.
+        """
+        hashes, tats = self._hashes, self._tats
+        base = stripe * self.slots
+        position = (fingerprint // self.stripes) % self.slots
+        reusable = -1
+
+        for _ in range(self.slots):
+            slot = base + position
+            held = hashes[slot]
+            if held == fingerprint:
+                return slot
+            if held == 0:
+                if reusable >= 0:
+                    return reusable
+                if self._used[stripe] >= self._max_used and self._compact(stripe, now):
+                    return self._find(stripe, fingerprint, now)
+                return slot
+            if reusable < 0 and tats[slot] <= now:
+                reusable = slot
+
+            position += 1
+            if position == self.slots:
+                position = 0
+
+        # No empty slot left: compacting restores short probe runs if anything has expired
+        if self._compact(stripe, now):
+            return self._find(stripe, fingerprint, now)
+        return reusable
+
+    def _compact(self, stripe: int, now: float) -> bool:
+        """Drop expired slots of a stripe and re-place the rest; False if nothing was freed"""
+        hashes, tats = self._hashes, self._tats
+        base = stripe * self.slots
+        live = [(hashes[slot], tats[slot]) for slot in range(base, base + self.slots)
+                if hashes[slot] and tats[slot] > now]
+        if len(live) == self._used[stripe]:
+            return False
+
+        for slot in range(base, base + self.slots):
+            hashes[slot] = 0
+        for fingerprint, tat in live:
+            position = (fingerprint // self.stripes) % self.slots
+            while hashes[base + position]:
+                position = position + 1 if position + 1 < self.slots else 0
+            hashes[base + position] = fingerprint
+            tats[base + position] = tat
+
+        self._used[stripe] = len(live)
+        return True
+
+    def acquire(self, key: Hashable, interval: float, burst: int) -> Tuple[bool, int]:
+        """Take one request from ``key``'s shared bucket; same contract as RateLimiter.acquire"""
+        fingerprint = _fingerprint(key)
+        stripe = fingerprint % self.stripes
+
+        with self._locks[stripe]:
+            now = self._clock()
+            slot = self._find(stripe, fingerprint, now)
+            if slot < 0:
+                self._overflows[stripe] += 1
+                return True, 0
+
+            held = self._hashes[slot]
+            tat = self._tats[slot] if held == fingerprint else now
+            if tat < now:
+                tat = now
+
+            new_tat = tat + interval
+            if new_tat - now > burst * interval:
+                return False, ceil((tat - now) / interval)
+
+            if held == 0:
+                self._used[stripe] += 1
+            self._hashes[slot] = fingerprint
+            self._tats[slot] = new_tat
+
+        return True, ceil((new_tat - now) / interval)
+
+    def retry_after(self, key: Hashable, interval: float, burst: int) -> float:
+        """Seconds until ``key`` may make its next request (0 if it may now)"""
+        fingerprint = _fingerprint(key)
+        stripe = fingerprint % self.stripes
+
+        with self._locks[stripe]:
+            now = self._clock()
+            slot = self._find(stripe, fingerprint, now)
+            tat = self._tats[slot] if slot >= 0 and self._hashes[slot] == fingerprint else now
+
+        return max(0.0, tat + interval - burst * interval - now)
+
+    def reset(self, key: Hashable) -> None:
+        fingerprint = _fingerprint(key)
+        stripe = fingerprint % self.stripes
+
+        with self._locks[stripe]:
+            slot = self._find(stripe, fingerprint, self._clock())
+            if slot >= 0 and self._hashes[slot] == fingerprint:
+                self._tats[slot] = 0.0
+
+    def __len__(self) -> int:
+        """Number of keys with an active (not yet refilled) bucket"""
+        now = self._clock()
+        return sum(1 for slot in range(self.capacity) if self._hashes[slot] and self._tats[slot] > now)
+
+    def close(self) -> None:
+        """Detach this process; the creating process also frees the segment"""
+        for view in (self._hashes, self._tats, self._used, self._overflows):
+            view.release()
+        self._shm.close()
+        if self._owner_pid == os.getpid():
+            self._shm.unlink()
+
+
+def _shared_limiter_worker(limiter: SharedMemoryRateLimiter, requests: int, interval: float, burst: int,
+                           results) -> None:
+    allowed = sum(limiter.acquire("client", interval, burst)[0] for _ in range(requests))
+    results.put(allowed)
+    limiter.close()
+
+
+# Example usage
+if __name__ == "__main__":
+    limiter = RateLimiter()
+
+    # 600 requests per minute with a burst of 100
+    interval, burst = 60 / 600, 100
+    results = [limiter.acquire("client", interval, burst) for _ in range(105)]
+    print(f"Allowed {sum(allowed for allowed, _ in results)} of {len(results)} back-to-back requests")
+    print(f"Retry after {limiter.retry_after('client', interval, burst):.3f}s")
+
+    started = time.perf_counter()
+    for _ in range(1_000_000):
+        limiter.acquire("client", 1e-9, 1 << 30)
+    print(f"{(time.perf_counter() - started) * 1e3:.0f} ns per check")
+
+    # Four processes share one budget of 100 per 10 s with a burst of 50
+    shared = SharedMemoryRateLimiter()
+    results = multiprocessing.Queue()
+    workers = [
+        multiprocessing.Process(target=_shared_limiter_worker, args=(shared, 1000, 0.1, 50, results))
+        for _ in range(4)
+    ]
+    started = time.monotonic()
+    for worker in workers:
+        worker.start()
+    allowed = sum(results.get() for _ in workers)
+    for worker in workers:
+        worker.join()
+    elapsed = time.monotonic() - started
+    print(f"Shared limiter admitted {allowed} of 4000 requests across 4 processes "
+          f"(budget ~{50 + elapsed / 0.1:.0f} over {elapsed:.2f}s)")
+    shared.close()
@@ -0,0 +1,147 @@
+"""
+QSN-API: Token security tests
+Forged, altered, unconfigured and expired tokens must never verify
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'qsn-core'))
+
+from qsn_api_security import QSN_API_Security
+from qsn_quantum_core import QSNQuantumCore
+
+
+SECRETS = {65: b'free-tier-secret', 99: b'business-tier-secret'}
+
+
+def _b64(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b'=')
+
+
+def _forge(claims: dict, secret: bytes, header: bytes = QSN_API_Security.JWT_HEADER) -> str:
+    """A token signed outside the API, the way an attacker would mint one"""
+    body = _b64(json.dumps(claims).encode())
+    signature = _b64(hmac.new(secret, header + b'.' + body, hashlib.sha256).digest())
+    return b'.'.join((header, body, signature)).decode('ascii')
+
+
+def _claims(security_level: int, lifetime: timedelta = timedelta(hours=1)) -> dict:
+    return {
+        'api_key': 'QSN_TEST_KEY',
+        'security_level': security_level,
+        'issued_at': datetime.now().isoformat(),
+        'expires_at': (datetime.now() + lifetime).isoformat(),
+        'quantum_verified': True
+    }
+
+
+@pytest.fixture
+def api():
+    return QSN_API_Security(QSNQuantumCore(), signing_secrets=SECRETS)
+
+
+def test_issued_token_verifies(api):
+    token = api.issue_quantum_token('QSN_TEST_KEY', 99)['quantum_token']
+    result = api.verify_quantum_token(token)
+
+    assert result['valid']
+    assert result['claims']['api_key'] == 'QSN_TEST_KEY'
+
+
+def test_tampered_signature_is_rejected(api):
+    header, claims, signature = api.issue_quantum_token('QSN_TEST_KEY', 99)['quantum_token'].split('.')
+    tampered = signature[:-1] + ('A' if signature[-1] != 'A' else 'B')
+
+    result = api.verify_quantum_token('.'.join((header, claims, tampered)))
+    assert result == {'valid': False, 'reason': 'Invalid signature', 'threat_level': 'HIGH'}
+
+
+def test_tampered_claims_are_rejected(api):
+    header, _, signature = api.issue_quantum_token('QSN_TEST_KEY', 65)['quantum_token'].split('.')
+    claims = _b64(json.dumps(_claims(1000)).encode()).decode('ascii')
+
+    assert not api.verify_quantum_token('.'.join((header, claims, signature)))['valid']
+
+
+@pytest.mark.parametrize('header', [
+    {'alg': 'none', 'typ': 'JWT'},
+    {'alg': 'HS512', 'typ': 'JWT'},
+])
+def test_non_hs256_header_is_rejected(api, header):
+    token = _forge(_claims(99), SECRETS[99], _b64(json.dumps(header).encode()))
+
+    result = api.verify_quantum_token(token)
+    assert result == {'valid': False, 'reason': 'Malformed token', 'threat_level': 'HIGH'}
+
+
+def test_unknown_level_is_rejected(api):
+    token = _forge(_claims(7), b'quantum_secret_7')
+
+    result = api.verify_quantum_token(token)
+    assert result == {'valid': False, 'reason': 'Invalid signature', 'threat_level': 'HIGH'}
+    assert 7 not in api._signers
+
+
+def test_placeholder_secrets_never_verify(api):
+    # Level 100 has no configured secret, so the public placeholder would sign it
+    token = _forge(_claims(100), b'quantum_secret_100')
+    assert api.verify_quantum_token(token)['reason'] == 'Signing secret not configured'
+
+    # Configured levels do not accept their placeholder either
+    assert api.verify_quantum_token(_forge(_claims(99), b'quantum_secret_99'))['reason'] == 'Invalid signature'
+
+
+def test_default_instance_verifies_nothing():
+    api = QSN_API_Security(QSNQuantumCore())
+    token = api.issue_quantum_token('QSN_TEST_KEY', 65)['quantum_token']
+
+    assert not api.verify_quantum_token(token)['valid']
+
+
+def test_expired_token_is_rejected(api):
+    token = _forge(_claims(65, lifetime=timedelta(seconds=-1)), SECRETS[65])
+
+    result = api.verify_quantum_token(token)
+    assert result == {'valid': False, 'reason': 'Token expired', 'threat_level': 'MEDIUM'}
+
+
+def test_cached_token_expires(api):
+    api.TOKEN_LIFETIME = timedelta(milliseconds=200)
+    token = api.issue_quantum_token('QSN_TEST_KEY', 65)['quantum_token']
+
+    assert api.verify_quantum_token(token)['valid']
+    assert len(api._verified) == 1
+    assert api.verify_quantum_token(token)['valid']  # Served from the cache
+
+    time.sleep(0.3)
+    result = api.verify_quantum_token(token)
+    assert result == {'valid': False, 'reason': 'Token expired', 'threat_level': 'MEDIUM'}
+    assert len(api._verified) == 0
+
+
+def test_rotation_clears_cached_verifications(api):
+    token = api.issue_quantum_token('QSN_TEST_KEY', 99)['quantum_token']
+    assert api.verify_quantum_token(token)['valid']
+    assert len(api._verified) == 1
+
+    api.rotate_signing_secret(99, b'rotated-business-secret')
+
+    assert len(api._verified) == 0
+    assert api.verify_quantum_token(token)['reason'] == 'Invalid signature'
+    assert api.verify_quantum_token(api.issue_quantum_token('QSN_TEST_KEY', 99)['quantum_token'])['valid']
+
+
+def test_invalid_secrets_are_refused():
+    with pytest.raises(ValueError):
+        QSN_API_Security(QSNQuantumCore(), signing_secrets={7: b'secret'})
+    with pytest.raises(ValueError):
+        QSN_API_Security(QSNQuantumCore(), signing_secrets={65: b''})
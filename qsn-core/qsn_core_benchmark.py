@@ -0,0 +1,293 @@
+"""
+QSN-CORE: Encoding Benchmarks
+Throughput, latency and peak-memory measurements for the Metatron's Cube encoder
+"""
+
+import argparse
+import json
+import os
+import platform
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from qsn_quantum_core import QSNQuantumCore
+
+
+# Payload sizes of the encode suite, 100 B to 100 MB
+SUITE_SIZES = [100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000, 100_000_000]
+
+# Latency percentiles reported per (level, size) case
+PERCENTILES = [50, 90, 99]
+
+
+def make_payloads(count: int, size: int, seed: int = 0) -> List[bytes]:
+    """Build ``count`` deterministic printable payloads of ``size`` bytes"""
+    rng = np.random.default_rng(seed)
+    data = rng.integers(32, 127, count * size, dtype=np.uint8).tobytes()
+    return [data[i * size:(i + 1) * size] for i in range(count)]
+
+
+def benchmark_encode_many(core: QSNQuantumCore, count: int = 100_000, size: int = 200,
+                          security_level: int = 99, loop_sample: int = 10_000) -> Dict:
+    """Compare encode_many against a per-call metatrons_cube_encoding loop
+
+    The per-call loop renders the full legacy result for every payload and
+    is timed over the first ``loop_sample`` payloads; its items/s rate is
+    what the batch rate is compared against.
+    """
+    payloads = make_payloads(count, size)
+    texts = [payload.decode('ascii') for payload in payloads[:loop_sample]]
+
+    started = time.perf_counter()
+    for text in texts:
+        core.metatrons_cube_encoding(text, security_level)
+    loop_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for payload in payloads[:loop_sample]:
+        core.encode_payload(payload, security_level)
+    payload_loop_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    core.encode_many(payloads, security_level)
+    batch_seconds = time.perf_counter() - started
+
+    loop_rate = len(texts) / loop_seconds
+    payload_loop_rate = len(texts) / payload_loop_seconds
+    batch_rate = count / batch_seconds
+
+    return {
+        'benchmark': 'encode_many',
+        'security_level': security_level,
+        'items': count,
+        'item_size': size,
+        'loop_items_per_second': loop_rate,
+        'payload_loop_items_per_second': payload_loop_rate,
+        'batch_items_per_second': batch_rate,
+        'batch_mb_per_second': count * size / batch_seconds / 1e6,
+        'speedup_vs_loop': batch_rate / loop_rate,
+        'speedup_vs_payload_loop': batch_rate / payload_loop_rate
+    }
+
+
+def benchmark_parallel_scaling(size: int = 1 << 30, worker_counts: Optional[List[int]] = None,
+                               security_level: int = 99) -> Dict:
+    """Measure encode_payload speedup from the process pool
+
+    Encodes one ``size``-byte buffer with each worker count (default:
+    powers of two up to the CPU count) and reports throughput and speedup
+    relative to the single-process path.
+    """
+    if worker_counts is None:
+        cpu_count = os.cpu_count() or 1
+        worker_counts = [1 << power for power in range(cpu_count.bit_length()) if 1 << power <= cpu_count]
+        if worker_counts[-1] != cpu_count:
+            worker_counts.append(cpu_count)
+
+    data = np.random.default_rng(0).integers(0, 256, size, dtype=np.uint8).tobytes()
+    runs = []
+
+    for workers in worker_counts:
+        core = QSNQuantumCore(parallel_threshold=0 if workers > 1 else size + 1, max_workers=workers)
+
+        started = time.perf_counter()
+        core.encode_payload(data, security_level)
+        seconds = time.perf_counter() - started
+
+        runs.append({
+            'workers': workers,
+            'seconds': seconds,
+            'mb_per_second': size / seconds / 1e6
+        })
+
+    baseline = runs[0]['seconds']
+    for run in runs:
+        run['speedup'] = baseline / run['seconds']
+        run['efficiency'] = run['speedup'] / run['workers'] * worker_counts[0]
+
+    return {
+        'benchmark': 'parallel_scaling',
+        'security_level': security_level,
+        'input_bytes': size,
+        'runs': runs
+    }
+
+
+def benchmark_encode_suite(core: QSNQuantumCore, sizes: Sequence[int] = SUITE_SIZES,
+                           levels: Optional[Sequence[int]] = None, method: str = 'encode_payload',
+                           precision: str = 'float32', byte_budget: int = 256 << 20,
+                           max_repeats: int = 1000) -> Dict:
+    """Throughput, latency percentiles and peak memory per (level, size)
+
+    Each case encodes one payload ``repeats`` times, where ``repeats``
+    spends roughly ``byte_budget`` input bytes (at least 3, at most
+    ``max_repeats``). Timed calls run with tracemalloc off; the peak is
+    taken from one extra call traced on its own, so tracing overhead
+    never leaks into the timings. ``method`` is ``encode_payload`` or
+    ``metatrons_cube_encoding`` (which adds the legacy result wrapping).
+
+    Cases at or above the core's ``parallel_threshold`` go through the
+    process pool and are flagged ``parallel``; their timings include
+    starting the pool, and their peak excludes the shared-memory segments
+    and worker processes, which tracemalloc cannot see.
+    """
+    if method not in ('encode_payload', 'metatrons_cube_encoding'):
+        raise ValueError(f"Unsupported method: {method}")
+    if levels is None:
+        levels = list(core.security_levels)
+
+    if method == 'encode_payload':
+        encode = lambda data, level: core.encode_payload(data, level, precision=precision)
+    else:
+        encode = lambda data, level: core.metatrons_cube_encoding(data, level, precision=precision)
+
+    cases = []
+    for size in sizes:
+        data = make_payloads(1, size)[0]
+        if method == 'metatrons_cube_encoding':
+            data = data.decode('ascii')
+        repeats = max(3, min(max_repeats, byte_budget // size))
+
+        for level in levels:
+            encode(data, level)  # Warm-up
+
+            latencies = np.empty(repeats)
+            for repeat in range(repeats):
+                started = time.perf_counter()
+                encode(data, level)
+                latencies[repeat] = time.perf_counter() - started
+
+            tracemalloc.start()
+            encode(data, level)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            total_seconds = float(latencies.sum())
+            cases.append({
+                'security_level': level,
+                'input_bytes': size,
+                'parallel': core.max_workers > 1 and size >= core.parallel_threshold,
+                'repeats': repeats,
+                'mb_per_second': size * repeats / total_seconds / 1e6,
+                'latency_seconds': {
+                    'mean': total_seconds / repeats,
+                    'min': float(latencies.min()),
+                    **{f"p{percentile}": float(value)
+                       for percentile, value in zip(PERCENTILES, np.percentile(latencies, PERCENTILES))}
+                },
+                'peak_traced_bytes': peak,
+                'peak_bytes_per_input_byte': peak / size
+            })
+
+    return {
+        'benchmark': 'encode_suite',
+        'method': method,
+        'precision': precision,
+        'parallel_threshold': core.parallel_threshold,
+        'max_workers': core.max_workers,
+        'cases': cases
+    }
+
+
+def environment_info() -> Dict:
+    """Machine and library versions recorded alongside benchmark results"""
+    return {
+        'timestamp': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count()
+    }
+
+
+def compare_suites(baseline: Dict, current: Dict) -> List[Dict]:
+    """Per-case throughput ratio (current / baseline) of two encode_suite results"""
+    baseline_cases = {(case['security_level'], case['input_bytes']): case for case in baseline['cases']}
+    comparison = []
+
+    for case in current['cases']:
+        previous = baseline_cases.get((case['security_level'], case['input_bytes']))
+        if previous is None:
+            continue
+        comparison.append({
+            'security_level': case['security_level'],
+            'input_bytes': case['input_bytes'],
+            'baseline_mb_per_second': previous['mb_per_second'],
+            'mb_per_second': case['mb_per_second'],
+            'throughput_ratio': case['mb_per_second'] / previous['mb_per_second'],
+            'peak_ratio': case['peak_traced_bytes'] / max(previous['peak_traced_bytes'], 1)
+        })
+
+    return comparison
+
+
+def main(argv: Optional[Sequence[str]] = None) -> Dict:
+    parser = argparse.ArgumentParser(description="QSN core encoding benchmarks")
+    parser.add_argument('--benchmark', dest='benchmarks', action='append',
+                        choices=['suite', 'encode_many', 'parallel'], help="benchmark to run, repeatable (default: suite)")
+    parser.add_argument('--sizes', type=int, nargs='+', default=SUITE_SIZES, help="suite payload sizes in bytes")
+    parser.add_argument('--levels', type=int, nargs='+', help="suite security levels (default: all)")
+    parser.add_argument('--method', default='encode_payload', choices=['encode_payload', 'metatrons_cube_encoding'])
+    parser.add_argument('--precision', default='float32', choices=['float64', 'float32', 'float16'])
+    parser.add_argument('--byte-budget', type=int, default=256 << 20, help="input bytes to encode per suite case")
+    parser.add_argument('--parallel-threshold', type=int,
+                        help="suite inputs of at least this many bytes use the process pool (default: never)")
+    parser.add_argument('--output', help="write the JSON results to this file")
+    parser.add_argument('--compare', help="encode_suite JSON from an earlier run to compare against")
+    args = parser.parse_args(argv)
+
+    core = QSNQuantumCore()
+    results = {'environment': environment_info(), 'results': []}
+
+    for name in dict.fromkeys(args.benchmarks or ['suite']):
+        if name == 'suite':
+            # Serial unless asked otherwise, so every case measures the same single-process encoder
+            threshold = args.parallel_threshold if args.parallel_threshold is not None else max(args.sizes) + 1
+            suite_core = QSNQuantumCore(parallel_threshold=threshold)
+            suite = benchmark_encode_suite(suite_core, args.sizes, args.levels, args.method, args.precision,
+                                           args.byte_budget)
+            results['results'].append(suite)
+            print(f"=== encode suite ({args.method}, {args.precision}) ===")
+            for case in suite['cases']:
+                latency = case['latency_seconds']
+                print(f"level {case['security_level']:>4} {case['input_bytes']:>11} B: "
+                      f"{case['mb_per_second']:9.1f} MB/s  p50 {latency['p50'] * 1e3:9.3f} ms  "
+                      f"p99 {latency['p99'] * 1e3:9.3f} ms  peak {case['peak_traced_bytes'] / 1e6:9.2f} MB"
+                      f"{'  (parallel; peak excludes shared memory)' if case['parallel'] else ''}")
+
+            if args.compare:
+                with open(args.compare) as source:
+                    previous = json.load(source)
+                baseline = next(result for result in previous['results'] if result['benchmark'] == 'encode_suite')
+                results['comparison'] = compare_suites(baseline, suite)
+                print("\n=== vs baseline ===")
+                for row in results['comparison']:
+                    print(f"level {row['security_level']:>4} {row['input_bytes']:>11} B: "
+                          f"{row['throughput_ratio']:.2f}x throughput, {row['peak_ratio']:.2f}x peak")
+        elif name == 'encode_many':
+            result = benchmark_encode_many(core)
+            results['results'].append(result)
+            print("=== encode_many vs per-call loop ===")
+            for key, value in result.items():
+                print(f"{key}: {value}")
+        else:
+            scaling = benchmark_parallel_scaling(size=256 << 20)
+            results['results'].append(scaling)
+            print("=== Parallel encoding scaling (256 MB) ===")
+            for run in scaling['runs']:
+                print(f"{run['workers']} workers: {run['mb_per_second']:.1f} MB/s, speedup {run['speedup']:.2f}x")
+
+    if args.output:
+        with open(args.output, 'w') as out:
+            json.dump(results, out, indent=2)
+
+    return results
+
+
+# Example usage
+if __name__ == "__main__":
+    main()
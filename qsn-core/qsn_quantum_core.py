@@ -6,15 +6,968 @@ True Quantum Encoding with Duel Quantum Coding
 
 import numpy as np
 import json
+import mmap
+import multiprocessing
+import os
+import threading
+import time
+import weakref
+from collections import Counter, OrderedDict
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
 from math import pi, sqrt
 from datetime import datetime
-from typing import Dict, List, Tuple
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 import hashlib
 
+
+class _FrozenDict(dict):
+    """Read-only dict that still serializes with json.dumps"""
+    
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Shared encoding artifacts are read-only")
+    
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+    
+    def __reduce__(self):
+        return (_FrozenDict, (dict(self),))
+
+
+class _FrozenList(list):
+    """Read-only list; still a list for isinstance checks, == and json.dumps"""
+    
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Shared encoding artifacts are read-only")
+    
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _readonly
+    append = extend = insert = pop = remove = clear = sort = reverse = _readonly
+    
+    def __reduce__(self):
+        return (_FrozenList, (list(self),))
+
+
+def _freeze(value):
+    """Recursively convert dicts and lists into read-only equivalents"""
+    if isinstance(value, dict):
+        return _FrozenDict((key, _freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return _FrozenList(_freeze(item) for item in value)
+    if isinstance(value, tuple):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+# A long, read-only run of the 12-vertex cycle; vertex columns are sliced from it
+_VERTEX_CYCLE = np.tile(np.arange(12, dtype=np.uint8), 1 << 16)
+_VERTEX_CYCLE.flags.writeable = False
+
+
+def _gather_records(table: np.ndarray, byte_values: np.ndarray, out: np.ndarray, start: int = 0,
+                    index_buffer: Optional[np.ndarray] = None) -> None:
+    """Fill ``out`` with the table records of ``byte_values`` and assign vertices
+    
+    ``index_buffer`` is an optional intp scratch array of at least
+    ``len(byte_values)`` entries; without it np.take allocates its own
+    intp copy of the indices.
+    """
+    length = len(out)
+    
+    if index_buffer is not None:
+        indices = index_buffer[:length]
+        np.copyto(indices, byte_values)
+        byte_values = indices
+    
+    # Gather whole records as raw byte rows; much faster than a structured take.
+    # Byte values always index the 256-row table, and mode='clip' writes
+    # straight into ``out`` where the default mode would buffer a full copy.
+    np.take(
+        table.view(np.uint8).reshape(len(table), table.itemsize),
+        byte_values,
+        axis=0,
+        out=out.view(np.uint8).reshape(length, table.itemsize),
+        mode='clip'
+    )
+    
+    _assign_vertices(out, start)
+
+
+def _assign_vertices(out: np.ndarray, start: int = 0) -> None:
+    """Set ``out['vertex']`` to the i % 12 vertex of global indices start, start + 1, ..."""
+    
+    # Slice vertices from the shared cycle, one cycle-sized run at a time
+    run = len(_VERTEX_CYCLE) - 12
+    offset = start % 12
+    vertices = out['vertex']
+    for run_start in range(0, len(out), run):
+        run_stop = min(run_start + run, len(out))
+        vertices[run_start:run_stop] = _VERTEX_CYCLE[offset:offset + run_stop - run_start]
+
+
+def _file_backing(records: np.ndarray) -> Optional[np.memmap]:
+    """The file memmap ``records`` is a view into, if any"""
+    array = records
+    while isinstance(array.base, np.ndarray):
+        array = array.base
+    return array if isinstance(array, np.memmap) and array.filename else None
+
+
+def _writable_file_view(records: np.ndarray, backing: np.memmap) -> np.ndarray:
+    """Writeable memmap of the same file rows as the read-only ``records`` view of ``backing``"""
+    if records.dtype != backing.dtype or not records.flags.c_contiguous:
+        raise ValueError("Only contiguous record views of a file-backed encoding can be patched")
+    
+    writable = np.memmap(backing.filename, dtype=backing.dtype, mode='r+', offset=backing.offset, shape=backing.shape)
+    start = (records.__array_interface__['data'][0] - backing.__array_interface__['data'][0]) // backing.itemsize
+    return writable[start:start + len(records)]
+
+
+def _encode_shard(input_name: str, output_name: str, table: np.ndarray, length: int,
+                  shard_start: int, shard_stop: int, start: int) -> None:
+    """Process-pool worker: encode one shard of a shared-memory buffer in place"""
+    input_shm = SharedMemory(name=input_name)
+    output_shm = SharedMemory(name=output_name)
+    try:
+        byte_values = np.ndarray(length, dtype=np.uint8, buffer=input_shm.buf)
+        records = np.ndarray(length, dtype=table.dtype, buffer=output_shm.buf)
+        _gather_records(
+            table,
+            byte_values[shard_start:shard_stop],
+            records[shard_start:shard_stop],
+            start + shard_start
+        )
+        del byte_values, records
+    finally:
+        input_shm.close()
+        output_shm.close()
+
+
+def _pool_context():
+    """Start method for encoding process pools: never fork a possibly multithreaded process"""
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+
+
+# Selectable float column precisions of encoded payloads
+#
+# Every stored float is the float64 value rounded to nearest, so its
+# relative error is at most 2**-53 (float64), 2**-24 (float32, ~6e-8) or
+# 2**-11 (float16, ~4.9e-4). In absolute terms float16 stays within
+# 2.5e-4 on amplitude, 2e-3 on phase, 3.7e-3 on golden phase and 1.6e-2 on
+# security phase. The decoder only needs amplitude * 255 and
+# phase * 128 / pi within 0.5 of the byte value (worst case 0.08 at
+# float16), so every precision still decodes bytes exactly.
+PRECISIONS = {
+    'float64': np.float64,
+    'float32': np.float32,
+    'float16': np.float16
+}
+
+
+def _precision_name(precision) -> str:
+    """Normalize a precision given as a name or NumPy float type"""
+    name = np.dtype(precision).name if not isinstance(precision, str) else precision
+    if name not in PRECISIONS:
+        raise ValueError(f"Invalid precision: {precision}")
+    return name
+
+
+class VertexIndex:
+    """Compressed sparse row index from outer-ring vertex to record positions
+    
+    ``positions[indptr[k]:indptr[k + 1]]`` are the record positions assigned
+    to vertex ``k``, in ascending order.
+    """
+    
+    VERTEX_COUNT = 12
+    
+    def __init__(self, indptr: np.ndarray, positions: np.ndarray):
+        self.indptr = indptr
+        self.positions = positions
+    
+    @classmethod
+    def build(cls, vertices: np.ndarray) -> 'VertexIndex':
+        """Counting-sort a vertex column into CSR form in O(n)"""
+        counts = np.bincount(vertices, minlength=cls.VERTEX_COUNT)
+        indptr = np.zeros(len(counts) + 1, dtype=np.intp)
+        np.cumsum(counts, out=indptr[1:])
+        
+        # A stable sort of a uint8 key is a radix sort and keeps positions ascending
+        positions = np.argsort(vertices, kind='stable')
+        return cls(indptr, positions)
+    
+    def __len__(self) -> int:
+        return len(self.indptr) - 1
+    
+    def rows(self, vertex: int) -> np.ndarray:
+        """Record positions assigned to ``vertex``"""
+        return self.positions[self.indptr[vertex]:self.indptr[vertex + 1]]
+    
+    @property
+    def counts(self) -> np.ndarray:
+        return np.diff(self.indptr)
+
+
+class EncodedPayload:
+    """Compact encoded payload backed by a NumPy structured array
+    
+    One fixed-size record per input byte holds the amplitude, phase,
+    golden phase, security phase and vertex assignment of that byte.
+    ``start`` is the global vector index of the first record, so a
+    payload can also describe one block of a longer encoding.
+    
+    Columns are float32 by default (17 bytes per vector); the original
+    byte is still recovered exactly from the amplitude column.
+    """
+    
+    FIELDS = ('amplitude', 'phase', 'golden_phase', 'security_phase', 'vertex')
+    
+    def __init__(self, vectors: np.ndarray, security_level: int, start: int = 0):
+        self.vectors = vectors
+        self.security_level = security_level
+        self.start = start
+        self._vertex_index: Optional[VertexIndex] = None
+    
+    @staticmethod
+    def make_dtype(float_dtype=np.float32) -> np.dtype:
+        """Record layout for one encoded vector"""
+        return np.dtype([
+            ('amplitude', float_dtype),
+            ('phase', float_dtype),
+            ('golden_phase', float_dtype),
+            ('security_phase', float_dtype),
+            ('vertex', np.uint8)
+        ])
+    
+    @classmethod
+    def empty(cls, length: int, security_level: int, start: int = 0, float_dtype=np.float32) -> 'EncodedPayload':
+        """Allocate an uninitialised payload of ``length`` vectors"""
+        return cls(np.empty(length, dtype=cls.make_dtype(float_dtype)), security_level, start)
+    
+    @classmethod
+    def from_buffer(cls, buffer, security_level: int, start: int = 0, float_dtype=np.float32) -> 'EncodedPayload':
+        """Wrap serialized records without copying them"""
+        return cls(np.frombuffer(buffer, dtype=cls.make_dtype(float_dtype)), security_level, start)
+    
+    def to_buffer(self) -> memoryview:
+        """Zero-copy byte view of the records, suitable for sockets and files"""
+        return memoryview(np.ascontiguousarray(self.vectors).view(np.uint8))
+    
+    def __len__(self) -> int:
+        return len(self.vectors)
+    
+    def __getitem__(self, field: str) -> np.ndarray:
+        return self.vectors[field]
+    
+    @property
+    def nbytes(self) -> int:
+        return self.vectors.nbytes
+    
+    @property
+    def precision(self) -> str:
+        """Name of the float column type (see PRECISIONS)"""
+        return self.vectors.dtype['amplitude'].name
+    
+    @property
+    def indices(self) -> np.ndarray:
+        """Global vector index of every record"""
+        return np.arange(self.start, self.start + len(self.vectors))
+    
+    @property
+    def byte_values(self) -> np.ndarray:
+        """Original byte values, recovered from the amplitude column"""
+        return np.rint(self.vectors['amplitude'].astype(np.float64) * 255.0).astype(np.uint8)
+    
+    @property
+    def vertex_index(self) -> VertexIndex:
+        """Per-vertex CSR index over the records, built on first use"""
+        if self._vertex_index is None:
+            self._vertex_index = VertexIndex.build(self.vectors['vertex'])
+        return self._vertex_index
+    
+    def vertex_records(self, vertex: int) -> np.ndarray:
+        """Records assigned to ``vertex``"""
+        return self.vectors[self.vertex_index.rows(vertex)]
+    
+    def vertex_mean(self, vertex: int, field: str = 'amplitude') -> float:
+        """Mean of ``field`` over one vertex, in O(vertex size)"""
+        rows = self.vertex_index.rows(vertex)
+        if not len(rows):
+            return float('nan')
+        return float(self.vectors[field][rows].mean(dtype=np.float64))
+    
+    def vertex_means(self, field: str = 'amplitude') -> np.ndarray:
+        """Mean of ``field`` for every vertex in one vectorized pass"""
+        counts = self.vertex_index.counts
+        sums = np.bincount(self.vectors['vertex'], weights=self.vectors[field], minlength=len(counts))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return sums / counts
+    
+    def vertex_histogram(self, vertex: int, field: str = 'phase', bins: int = 16,
+                         value_range: Optional[Tuple[float, float]] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Histogram of ``field`` over one vertex, in O(vertex size)"""
+        return np.histogram(self.vectors[field][self.vertex_index.rows(vertex)], bins=bins, range=value_range)
+
+
+class EncodedBatch:
+    """Columnar encoding of many payloads sharing one record buffer
+    
+    ``offsets[i]:offsets[i + 1]`` is the record range of item ``i``. Every
+    item is encoded as if on its own (vector indices and vertices restart
+    at zero), while the metadata and recovery key are shared by the batch.
+    """
+    
+    def __init__(self, payload: EncodedPayload, offsets: np.ndarray, metadata: Dict, recovery_key: Dict):
+        self.payload = payload
+        self.offsets = offsets
+        self.metadata = metadata
+        self.recovery_key = recovery_key
+    
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+    
+    def __getitem__(self, item: int) -> EncodedPayload:
+        """Zero-copy EncodedPayload view of one item"""
+        if not -len(self) <= item < len(self):
+            raise IndexError(f"Batch item out of range: {item}")
+        item %= len(self)
+        
+        return EncodedPayload(
+            self.payload.vectors[self.offsets[item]:self.offsets[item + 1]],
+            self.payload.security_level
+        )
+    
+    def __iter__(self) -> Iterator[EncodedPayload]:
+        for item in range(len(self)):
+            yield self[item]
+    
+    @property
+    def lengths(self) -> np.ndarray:
+        return np.diff(self.offsets)
+
+
+class EncodingStage:
+    """One named step of an EncodingPipeline
+    
+    ``func(columns, security_level)`` receives the current column dict and
+    returns it with its output columns added or replaced. An elementwise
+    stage computes row i from row i alone; if it reads the ``index``
+    column it must be marked ``positional``, otherwise it is assumed to
+    depend only on the byte value and security level.
+    """
+    
+    def __init__(self, name: str, func: Callable[[Dict[str, np.ndarray], int], Dict[str, np.ndarray]],
+                 elementwise: bool = True, positional: bool = False):
+        self.name = name
+        self.func = func
+        self.elementwise = elementwise
+        self.positional = positional
+    
+    def __repr__(self) -> str:
+        return f"EncodingStage({self.name!r}, elementwise={self.elementwise}, positional={self.positional})"
+
+
+class EncodingPipeline:
+    """Ordered, editable chain of encoding stages with a fusing planner
+    
+    Columns start as ``byte_value`` (uint8) plus ``index`` (global vector
+    index, created only if a positional stage needs it). The planner fuses
+    adjacent elementwise stages so each group makes one pass over the data:
+    
+    - ``table``: the leading run of byte-only stages is evaluated once per
+      security level over all 256 byte values and applied by gather;
+    - ``blocked``: any other elementwise run executes block by block, all
+      stages of the group on one cache-sized slice before the next;
+    - ``full``: a non-elementwise stage sees whole columns.
+    
+    ``version`` increases with every add/remove/reorder. Owners of tables
+    derived from the pipeline ``subscribe`` to rebuild them as part of the
+    edit itself; a subscriber that raises vetoes the edit, which is then
+    undone and the error re-raised from add/remove/reorder.
+    """
+    
+    def __init__(self, stages: Iterable[EncodingStage] = (), block_size: int = 1 << 16):
+        self.stages: List[EncodingStage] = list(stages)
+        self.block_size = block_size
+        self.version = 0
+        self._tables: Dict[int, Tuple[Dict[str, np.ndarray], Dict[str, float]]] = {}
+        self._subscribers: List[weakref.WeakMethod] = []
+    
+    @property
+    def names(self) -> List[str]:
+        return [stage.name for stage in self.stages]
+    
+    def _position(self, name: str) -> int:
+        if name not in self.names:
+            raise KeyError(f"Unknown encoding stage: {name}")
+        return self.names.index(name)
+    
+    def add(self, stage: EncodingStage, before: Optional[str] = None, after: Optional[str] = None) -> None:
+        """Insert a stage (at the end unless ``before``/``after`` names a stage)"""
+        if stage.name in self.names:
+            raise ValueError(f"Duplicate encoding stage: {stage.name}")
+        
+        stages = list(self.stages)
+        if before is not None:
+            stages.insert(self._position(before), stage)
+        elif after is not None:
+            stages.insert(self._position(after) + 1, stage)
+        else:
+            stages.append(stage)
+        self._changed(stages)
+    
+    def remove(self, name: str) -> EncodingStage:
+        stages = list(self.stages)
+        stage = stages.pop(self._position(name))
+        self._changed(stages)
+        return stage
+    
+    def reorder(self, names: Sequence[str]) -> None:
+        """Keep only the named stages, in the given order"""
+        stages = {stage.name: stage for stage in self.stages}
+        missing = [name for name in names if name not in stages]
+        if missing:
+            raise KeyError(f"Unknown encoding stages: {missing}")
+        
+        self._changed([stages[name] for name in names])
+    
+    def subscribe(self, callback: Callable[['EncodingPipeline'], None]) -> None:
+        """Call the bound method ``callback(pipeline)`` after every edit; held weakly"""
+        self._subscribers.append(weakref.WeakMethod(callback))
+    
+    def unsubscribe(self, callback: Callable[['EncodingPipeline'], None]) -> None:
+        self._subscribers = [ref for ref in self._subscribers if ref() is not None and ref() != callback]
+    
+    def _changed(self, stages: List[EncodingStage]) -> None:
+        """Install ``stages`` and notify subscribers, restoring the old stages if one refuses"""
+        previous = self.stages, self._tables, self.version
+        self.stages, self._tables = stages, {}
+        self.version += 1
+        
+        notified = []
+        try:
+            for ref in list(self._subscribers):
+                callback = ref()
+                if callback is not None:
+                    callback(self)
+                    notified.append(callback)
+        except Exception:
+            self.stages, self._tables, self.version = previous
+            for callback in notified:
+                callback(self)
+            raise
+    
+    def plan(self) -> List[Tuple[str, List[EncodingStage]]]:
+        """Group the stages into fused execution steps"""
+        groups: List[Tuple[str, List[EncodingStage]]] = []
+        
+        for stage in self.stages:
+            byte_only = stage.elementwise and not stage.positional
+            leading = not groups or (len(groups) == 1 and groups[0][0] == 'table')
+            
+            if byte_only and leading:
+                if not groups:
+                    groups.append(('table', []))
+                groups[0][1].append(stage)
+            elif not stage.elementwise:
+                groups.append(('full', [stage]))
+            elif groups and groups[-1][0] == 'blocked':
+                groups[-1][1].append(stage)
+            else:
+                groups.append(('blocked', [stage]))
+        
+        return groups
+    
+    def lookup_table(self, security_level: int) -> Dict[str, np.ndarray]:
+        """256-row columns of the fused byte-only stages, built once per level"""
+        return self._lookup_table(security_level)[0]
+    
+    def _lookup_table(self, security_level: int) -> Tuple[Dict[str, np.ndarray], Dict[str, float]]:
+        if security_level not in self._tables:
+            groups = self.plan()
+            stages = groups[0][1] if groups and groups[0][0] == 'table' else []
+            
+            columns = {'byte_value': np.arange(256, dtype=np.uint8)}
+            build_timings = {}
+            for stage in stages:
+                started = time.perf_counter()
+                columns = stage.func(columns, security_level)
+                build_timings[stage.name] = time.perf_counter() - started
+            
+            for column in columns.values():
+                if isinstance(column, np.ndarray):
+                    column.flags.writeable = False
+            self._tables[security_level] = (columns, build_timings)
+        
+        return self._tables[security_level]
+    
+    def run(self, data: Union[str, bytes, memoryview], security_level: int,
+            start: int = 0) -> Tuple[Dict[str, np.ndarray], Dict[str, float]]:
+        """Run the planned pipeline; returns the columns and per-stage seconds
+        
+        Stages fused into the lookup table report their one-off build time
+        (zero once the table is cached) and the gather is reported as
+        ``gather[<stage>+...]``.
+        """
+        byte_values = QSNQuantumCore._to_byte_array(data)
+        length = len(byte_values)
+        columns: Dict[str, np.ndarray] = {'byte_value': byte_values}
+        if any(stage.positional for stage in self.stages):
+            columns['index'] = np.arange(start, start + length)
+        
+        timings: Dict[str, float] = {}
+        
+        for kind, stages in self.plan():
+            if kind == 'table':
+                built = security_level not in self._tables
+                table, build_timings = self._lookup_table(security_level)
+                for stage in stages:
+                    timings[stage.name] = build_timings[stage.name] if built else 0.0
+                
+                started = time.perf_counter()
+                for name, column in table.items():
+                    if name == 'byte_value':
+                        continue
+                    if isinstance(column, np.ndarray) and column.shape == (256,):
+                        columns[name] = np.take(column, byte_values, mode='clip')
+                    else:
+                        columns[name] = column
+                timings[f"gather[{'+'.join(stage.name for stage in stages)}]"] = time.perf_counter() - started
+            
+            elif kind == 'blocked':
+                columns = self._run_blocked(stages, columns, security_level, length, timings)
+            
+            else:
+                stage = stages[0]
+                started = time.perf_counter()
+                columns = stage.func(columns, security_level)
+                timings[stage.name] = time.perf_counter() - started
+        
+        return columns, timings
+    
+    def _run_blocked(self, stages: List[EncodingStage], columns: Dict[str, np.ndarray], security_level: int,
+                     length: int, timings: Dict[str, float]) -> Dict[str, np.ndarray]:
+        """Run a fused elementwise group over cache-sized slices in one pass"""
+        for stage in stages:
+            timings.setdefault(stage.name, 0.0)
+        
+        outputs = dict(columns)
+        for block_start in range(0, max(length, 1), self.block_size):
+            block_stop = min(block_start + self.block_size, length)
+            inputs = {
+                name: column[block_start:block_stop] if isinstance(column, np.ndarray) and column.shape == (length,) else column
+                for name, column in columns.items()
+            }
+            
+            block = inputs
+            for stage in stages:
+                started = time.perf_counter()
+                block = stage.func(block, security_level)
+                timings[stage.name] += time.perf_counter() - started
+            
+            # Write back only the columns this group produced
+            for name, column in block.items():
+                if column is inputs.get(name):
+                    continue
+                if not isinstance(column, np.ndarray) or column.ndim == 0:
+                    outputs[name] = column
+                    continue
+                if outputs.get(name) is columns.get(name):
+                    outputs[name] = np.empty(length, dtype=column.dtype)
+                outputs[name][block_start:block_stop] = column
+        
+        return outputs
+
+
+class VectorMappingView(Mapping):
+    """Lazy, read-only ``vector_{i}`` mapping over an EncodedPayload
+    
+    Entries are rendered only when indexed or iterated; call
+    ``materialize()`` for a plain dict (e.g. before ``json.dumps``).
+    """
+    
+    def __init__(self, core: 'QSNQuantumCore', payload: EncodedPayload, cube_geometry: Dict):
+        self.core = core
+        self.payload = payload
+        self.cube_geometry = cube_geometry
+    
+    def _position(self, key) -> int:
+        """Map a ``vector_{i}`` key to a record position, or raise KeyError"""
+        if isinstance(key, str) and key.startswith('vector_'):
+            index = key[len('vector_'):]
+            # Only the canonical spelling is a key: no leading zeros, no non-ASCII digits
+            if index.isascii() and index.isdigit() and str(int(index)) == index:
+                position = int(index) - self.payload.start
+                if 0 <= position < len(self.payload):
+                    return position
+        raise KeyError(key)
+    
+    def __getitem__(self, key: str) -> Dict:
+        position = self._position(key)
+        record = EncodedPayload(
+            self.payload.vectors[position:position + 1],
+            self.payload.security_level,
+            self.payload.start + position
+        )
+        return self.core.render_vector_mapping(record, self.cube_geometry)[key]
+    
+    def __contains__(self, key) -> bool:
+        try:
+            self._position(key)
+        except KeyError:
+            return False
+        return True
+    
+    def __iter__(self) -> Iterator[str]:
+        for index in range(self.payload.start, self.payload.start + len(self.payload)):
+            yield f'vector_{index}'
+    
+    def __len__(self) -> int:
+        return len(self.payload)
+    
+    def __repr__(self) -> str:
+        return f"VectorMappingView({len(self)} vectors, security_level={self.payload.security_level})"
+    
+    def materialize(self) -> Dict:
+        """Render every entry into a plain dict"""
+        return self.core.render_vector_mapping(self.payload, self.cube_geometry)
+
+
+class EncodingCache:
+    """LRU cache of EncodedPayloads bounded by total record bytes
+    
+    Keys are ``(blake2b(data), security_level, precision)``. Cached payloads are
+    made read-only because every hit shares the same records. All methods
+    are safe to call from several threads.
+    """
+    
+    def __init__(self, max_bytes: int):
+        if max_bytes <= 0:
+            raise ValueError(f"Invalid cache size: {max_bytes}")
+        
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    @staticmethod
+    def make_key(data: bytes, security_level: int, precision: str = 'float32') -> Tuple[bytes, int, str]:
+        return hashlib.blake2b(data).digest(), security_level, precision
+    
+    def get(self, key: Tuple[bytes, int, str]) -> Optional[EncodedPayload]:
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is None:
+                self.misses += 1
+                return None
+            
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return payload
+    
+    def put(self, key: Tuple[bytes, int, str], payload: EncodedPayload) -> None:
+        if payload.nbytes > self.max_bytes:
+            return
+        
+        with self._lock:
+            if key in self._entries:
+                return
+            
+            payload.vectors.flags.writeable = False
+            self._entries[key] = payload
+            self.current_bytes += payload.nbytes
+            
+            while self.current_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.current_bytes -= evicted.nbytes
+                self.evictions += 1
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+    
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self.current_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
+
+
+class BufferPool:
+    """Reusable, size-classed record buffers for encoder outputs
+    
+    ``acquire(length)`` returns a buffer of at least ``length`` records
+    (rounded up to a power-of-two size class) to pass as ``out=`` to
+    ``QSNQuantumCore.encode_payload``; ``release`` hands it back once the
+    payload is no longer needed. Steady-state encoding of same-sized
+    messages then reuses the same few buffers instead of allocating.
+    """
+    
+    MIN_SIZE_CLASS = 64
+    
+    def __init__(self, dtype: Optional[np.dtype] = None, max_per_class: int = 64):
+        self.dtype = np.dtype(dtype) if dtype is not None else EncodedPayload.make_dtype()
+        self.max_per_class = max_per_class
+        self._free: Dict[int, List[np.ndarray]] = {}
+        self._lock = threading.Lock()
+        
+        self.allocations = 0
+        self.reuses = 0
+    
+    @classmethod
+    def size_class(cls, length: int) -> int:
+        """Smallest power-of-two capacity that holds ``length`` records"""
+        return max(cls.MIN_SIZE_CLASS, 1 << (length - 1).bit_length())
+    
+    def acquire(self, length: int) -> np.ndarray:
+        size_class = self.size_class(length)
+        
+        with self._lock:
+            free = self._free.get(size_class)
+            if free:
+                self.reuses += 1
+                return free.pop()
+            self.allocations += 1
+        
+        return np.empty(size_class, dtype=self.dtype)
+    
+    def release(self, buffer: np.ndarray) -> None:
+        """Return a buffer obtained from ``acquire``"""
+        size_class = len(buffer)
+        if buffer.dtype != self.dtype or size_class != self.size_class(size_class):
+            raise ValueError("Buffer was not acquired from this pool")
+        
+        with self._lock:
+            free = self._free.setdefault(size_class, [])
+            if len(free) < self.max_per_class:
+                free.append(buffer)
+
+
+class TemporalWarningStore:
+    """Fixed-capacity ring buffer of temporal warnings
+    
+    Once ``capacity`` warnings are held, each new warning overwrites the
+    oldest one. Per-severity counts are maintained on insert and eviction,
+    and every warning is stamped with ``time.monotonic()`` so time-range
+    queries are a binary search over the (non-decreasing) timestamps.
+    Appends and reads are serialized by a per-store lock; iteration walks
+    a snapshot taken under it.
+    """
+    
+    def __init__(self, capacity: int = 10000):
+        if capacity <= 0:
+            raise ValueError(f"Invalid capacity: {capacity}")
+        
+        self.capacity = capacity
+        self._entries: List[Optional[Dict]] = [None] * capacity
+        self._times = [0.0] * capacity
+        self._head = 0  # Slot of the oldest warning
+        self._size = 0
+        self._lock = threading.Lock()
+        
+        self.severity_counts = Counter()
+        self.total_recorded = 0
+        self.evicted = 0
+    
+    def append(self, entry: Dict, timestamp: Optional[float] = None) -> None:
+        """Store a warning, evicting the oldest one when full"""
+        if timestamp is None:
+            timestamp = time.monotonic()
+        
+        with self._lock:
+            if self._size:
+                timestamp = max(timestamp, self._times[self._slot(self._size - 1)])
+            
+            if self._size == self.capacity:
+                self.severity_counts[self._entries[self._head]['severity']] -= 1
+                self._head = (self._head + 1) % self.capacity
+                self._size -= 1
+                self.evicted += 1
+            
+            slot = self._slot(self._size)
+            self._entries[slot] = entry
+            self._times[slot] = timestamp
+            self._size += 1
+            
+            self.severity_counts[entry['severity']] += 1
+            self.total_recorded += 1
+    
+    def severity_snapshot(self) -> Tuple[int, int, Dict[str, int]]:
+        """Consistent ``(held, total_recorded, {severity: held count})`` triple"""
+        with self._lock:
+            return self._size, self.total_recorded, {
+                severity: count for severity, count in self.severity_counts.items() if count
+            }
+    
+    def _slot(self, position: int) -> int:
+        """Ring slot of the warning at logical position (0 = oldest)"""
+        return (self._head + position) % self.capacity
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    def __getitem__(self, position: Union[int, slice]) -> Union[Dict, List[Dict]]:
+        with self._lock:
+            if isinstance(position, slice):
+                return [self._entries[self._slot(index)] for index in range(*position.indices(self._size))]
+            if not -self._size <= position < self._size:
+                raise IndexError(f"Warning index out of range: {position}")
+            return self._entries[self._slot(position % self._size)]
+    
+    def __iter__(self) -> Iterator[Dict]:
+        with self._lock:
+            snapshot = [self._entries[self._slot(position)] for position in range(self._size)]
+        return iter(snapshot)
+    
+    def count(self, severity: Optional[str] = None) -> int:
+        """Number of held warnings, optionally of one severity"""
+        if severity is None:
+            return self._size
+        with self._lock:
+            return self.severity_counts[severity]
+    
+    def _bisect(self, timestamp: float, right: bool) -> int:
+        """First logical position whose time is >= (or > if ``right``) timestamp"""
+        low, high = 0, self._size
+        while low < high:
+            middle = (low + high) // 2
+            middle_time = self._times[self._slot(middle)]
+            if middle_time < timestamp or (right and middle_time == timestamp):
+                low = middle + 1
+            else:
+                high = middle
+        return low
+    
+    def between(self, start: float, end: float) -> List[Dict]:
+        """Warnings stamped within [start, end] on the time.monotonic() clock"""
+        with self._lock:
+            first = self._bisect(start, right=False)
+            last = self._bisect(end, right=True)
+            return [self._entries[self._slot(position)] for position in range(first, last)]
+    
+    def recent(self, seconds: float) -> List[Dict]:
+        """Warnings recorded within the last ``seconds`` seconds"""
+        now = time.monotonic()
+        return self.between(now - seconds, now)
+
+
+class StrataSecurityStore(Mapping):
+    """Bounded strata security layers keyed by level, in applied-time order
+    
+    Re-applying a level moves it to the newest position; once ``capacity``
+    levels are held, the least recently applied level is evicted. Writes
+    and range reads take a per-store lock; iteration walks a snapshot.
+    """
+    
+    def __init__(self, capacity: int = 1000):
+        if capacity <= 0:
+            raise ValueError(f"Invalid capacity: {capacity}")
+        
+        self.capacity = capacity
+        self._layers: OrderedDict = OrderedDict()
+        self._times: Dict[int, float] = {}
+        self._lock = threading.Lock()
+        self.total_applied = 0
+        self.evicted = 0
+    
+    def __setitem__(self, level: int, layer: Dict) -> None:
+        with self._lock:
+            if level in self._layers:
+                self._layers.move_to_end(level)
+            elif len(self._layers) == self.capacity:
+                # Evict first, so lock-free len() readers never see capacity + 1
+                oldest, _ = self._layers.popitem(last=False)
+                del self._times[oldest]
+                self.evicted += 1
+            
+            self._layers[level] = layer
+            self._times[level] = time.monotonic()
+            self.total_applied += 1
+    
+    def __getitem__(self, level: int) -> Dict:
+        return self._layers[level]
+    
+    def __iter__(self) -> Iterator[int]:
+        with self._lock:
+            return iter(list(self._layers))
+    
+    def __len__(self) -> int:
+        return len(self._layers)
+    
+    def between(self, start: float, end: float) -> Dict[int, Dict]:
+        """Layers applied within [start, end] on the time.monotonic() clock"""
+        layers = {}
+        
+        # Newest first, stopping at the first layer older than the range
+        with self._lock:
+            for level in reversed(self._layers):
+                applied = self._times[level]
+                if applied < start:
+                    break
+                if applied <= end:
+                    layers[level] = self._layers[level]
+        
+        return dict(reversed(layers.items()))
+
+
 class QSNQuantumCore:
-    """Quantum Security Network Core - True Quantum Encoding System"""
+    """Quantum Security Network Core - True Quantum Encoding System
+    
+    One instance can be shared by many threads. Encoding is lock-free: the
+    level tables, geometry and recovery keys are read-only after __init__,
+    gather scratch is per thread and every call writes only its own output.
+    The warning and strata stores and the encoding cache each guard their
+    own state with a private lock, and get_system_status reads a snapshot
+    that writers rebuild and swap in whole, so status reads never block.
+    """
+    
+    # Security phase multiplier per security level
+    PHASE_MULTIPLIERS = {
+        65: pi/4,     # Free/Public
+        99: pi/2,     # Business
+        100: pi,      # Government
+        1000: 2*pi    # Architect
+    }
+    
+    # Recovery protocol per security level
+    RECOVERY_PROTOCOLS = _freeze({
+        65: {
+            'steps': ['Golden ratio alignment', 'Basic phase correction'],
+            'requirements': ['Standard quantum resonator']
+        },
+        99: {
+            'steps': ['Golden ratio alignment', 'Advanced phase correction', 'Consciousness verification'],
+            'requirements': ['Enhanced quantum resonator', 'Consciousness monitor']
+        },
+        100: {
+            'steps': ['Golden ratio alignment', 'Government phase protocol', 'Temporal verification', 'Strata security check'],
+            'requirements': ['Military-grade quantum resonator', 'Temporal monitor', 'Strata security system']
+        },
+        1000: {
+            'steps': ['Developer-level quantum alignment', 'Multi-dimensional phase correction', 'Full consciousness integration', 'Temporal and strata verification'],
+            'requirements': ['Developer-grade quantum system', 'Full consciousness management', 'Advanced temporal monitoring']
+        }
+    })
+    
+    # Largest block (in bytes) whose gather indices use the per-thread scratch
+    SCRATCH_LIMIT = 1 << 16
     
-    def __init__(self):
+    def __init__(self, parallel_threshold: int = 64 << 20, max_workers: Optional[int] = None,
+                 warning_capacity: int = 10000, strata_capacity: int = 1000, cache_bytes: int = 0):
         # Quantum Constants
         self.golden_ratio = (1 + sqrt(5)) / 2  # φ = 1.61803
         self.phi_harmonic = 7.8  # Hz
@@ -34,8 +987,35 @@ class QSNQuantumCore:
         
         # Quantum State Storage
         self.quantum_states = {}
-        self.temporal_warnings = []
-        self.strata_security = {}
+        self.temporal_warnings = TemporalWarningStore(warning_capacity)
+        self.strata_security = StrataSecurityStore(strata_capacity)
+        
+        # Opt-in result cache for metatrons_cube_encoding, bounded by record bytes
+        self.encoding_cache = EncodingCache(cache_bytes) if cache_bytes else None
+        
+        # Per-vector encoding stages and the byte -> record lookup tables they fuse into;
+        # the tables are rebuilt whenever self.pipeline is edited or replaced
+        self._tables_lock = threading.Lock()
+        self._pipeline = None
+        self.pipeline = self.default_pipeline()
+        
+        # Inputs of at least parallel_threshold bytes are sharded over a process pool
+        self.parallel_threshold = parallel_threshold
+        self.max_workers = max_workers or os.cpu_count() or 1
+        
+        # Per-thread intp scratch for the gather indices of small blocks
+        self._scratch = threading.local()
+        
+        # Static encoding artifacts, computed once and shared read-only
+        self.cube_geometry = _freeze(self._build_cube_geometry())
+        self.recovery_keys = {
+            level: _freeze(self._build_recovery_key(level))
+            for level in self.security_levels
+        }
+        
+        # get_system_status snapshot; writers rebuild it under _status_lock and swap the reference
+        self._status_lock = threading.Lock()
+        self._status = self._build_status()
         
     def _initialize_ethics_circuit(self) -> Dict:
         """Initialize Quantum Asimov Laws Circuit"""
@@ -46,106 +1026,649 @@ class QSNQuantumCore:
             "qubit_3": "Zero Law: Protect humanity as a whole"
         }
     
-    def metatrons_cube_encoding(self, data: str, security_level: int) -> Dict:
-        """Encode data using Metatron's Cube 13-vertex geometry"""
-        
-        # Validate security level
-        if security_level not in self.security_levels:
-            raise ValueError(f"Invalid security level: {security_level}")
+    def metatrons_cube_encoding(self, data: str, security_level: int, precision: str = 'float32') -> Dict:
+        """Encode data using Metatron's Cube 13-vertex geometry
         
-        # Convert data to quantum vectors
-        quantum_vectors = self._text_to_quantum_vectors(data)
+        ``precision`` selects the float64/float32/float16 columns of the
+        underlying payload (see PRECISIONS for the error bounds).
+        """
         
-        # Apply golden ratio scaling
-        scaled_vectors = self._apply_golden_ratio(quantum_vectors)
+        # Encode into the compact columnar form
+        payload = self._cached_payload(data, security_level, precision)
         
-        # Apply quantum phase shifts based on security level
-        phase_shifted = self._apply_security_phase(scaled_vectors, security_level)
+        return self._build_result(payload)
+    
+    def _build_result(self, payload: EncodedPayload, **metadata) -> Dict:
+        """Wrap an EncodedPayload in the metatrons_cube_encoding result layout"""
+        security_level = payload.security_level
         
         # Create Metatron's Cube geometry mapping
-        cube_mapping = self._map_to_metatrons_cube(phase_shifted)
+        cube_mapping = self._map_to_metatrons_cube(payload)
         
         # Apply consciousness alignment
         consciousness_aligned = self._apply_consciousness_alignment(cube_mapping)
         
         return {
-            "metadata": {
-                "encoding_method": "Metatron's Cube Quantum Encoding",
-                "security_level": security_level,
-                "tier": self.security_levels[security_level],
-                "golden_ratio": self.golden_ratio,
-                "phi_harmonic": self.phi_harmonic,
-                "consciousness_level": self.consciousness_threshold,
-                "timestamp": datetime.now().isoformat()
-            },
+            "metadata": {**self._build_metadata(security_level), **metadata},
             "quantum_data": consciousness_aligned,
             "recovery_key": self._generate_recovery_key(security_level)
         }
     
-    def _text_to_quantum_vectors(self, text: str) -> List[Dict]:
-        """Convert text to quantum state vectors"""
-        vectors = []
-        text_bytes = text.encode('utf-8')
+    def _cached_payload(self, data: Union[str, bytes], security_level: int, precision: str = 'float32') -> EncodedPayload:
+        """Encode through the encoding cache when one is enabled"""
+        if self.encoding_cache is None:
+            return self.encode_payload(data, security_level, precision=precision)
+        
+        self._validate_security_level(security_level)
+        precision = _precision_name(precision)
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        
+        key = EncodingCache.make_key(data, security_level, precision)
+        payload = self.encoding_cache.get(key)
+        if payload is None:
+            payload = self._encode_block(data, security_level, precision=precision)
+            self.encoding_cache.put(key, payload)
+        
+        return payload
+    
+    def materialize(self, encoded: Dict) -> Dict:
+        """Copy of an encoding result with its lazy vector_mapping rendered
         
-        for i, byte_val in enumerate(text_bytes):
-            amplitude = byte_val / 255.0
-            phase = (byte_val * pi) / 128
+        The returned dict contains only plain containers and serializes
+        with ``json.dumps``.
+        """
+        quantum_data = dict(encoded['quantum_data'])
+        vector_mapping = quantum_data['vector_mapping']
+        if isinstance(vector_mapping, VectorMappingView):
+            quantum_data['vector_mapping'] = vector_mapping.materialize()
+        
+        return {**encoded, 'quantum_data': quantum_data}
+    
+    def encode_file(self, path: str, security_level: int, out_path: Optional[str] = None,
+                    block_size: int = 4 << 20, precision: str = 'float32') -> Dict:
+        """Encode a file straight to a memory-mapped ``.npy`` record file
+        
+        The input is mmap'ed and viewed as a uint8 array without copying,
+        and records are gathered block by block into the memory-mapped
+        output (default ``<path>.qsn.npy``). Memory use stays constant
+        regardless of file size, so files larger than RAM can be encoded.
+        The result's vector_mapping is a lazy view over the output file.
+        """
+        self._validate_security_level(security_level)
+        if out_path is None:
+            out_path = f"{path}.qsn.npy"
+        
+        table = self._level_table(security_level, precision)
+        
+        with open(path, 'rb') as source:
+            length = os.fstat(source.fileno()).st_size
             
-            vectors.append({
-                'index': i,
-                'amplitude': amplitude,
-                'phase': phase,
-                'byte_value': byte_val,
-                'quantum_state': f"|ψ⟩_{i} = {amplitude:.4f} + {phase:.4f}i"
-            })
+            if length == 0:
+                # Through a handle, since np.save would append .npy to a bare path
+                with open(out_path, 'wb') as out:
+                    np.save(out, np.empty(0, dtype=table.dtype))
+            else:
+                with mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    byte_values = np.frombuffer(mapped, dtype=np.uint8)
+                    records = np.lib.format.open_memmap(out_path, mode='w+', dtype=table.dtype, shape=(length,))
+                    
+                    for block_start in range(0, length, block_size):
+                        block_stop = min(block_start + block_size, length)
+                        _gather_records(
+                            table,
+                            byte_values[block_start:block_stop],
+                            records[block_start:block_stop],
+                            block_start
+                        )
+                    
+                    records.flush()
+                    del byte_values, records
         
-        return vectors
+        payload = EncodedPayload(np.load(out_path, mmap_mode='r'), security_level)
+        
+        return self._build_result(payload, source_path=str(path), output_path=str(out_path))
     
-    def _apply_golden_ratio(self, vectors: List[Dict]) -> List[Dict]:
-        """Apply golden ratio scaling to quantum vectors"""
-        scaled_vectors = []
+    def _build_metadata(self, security_level: int) -> Dict:
+        """Build the metadata block of an encoding result"""
+        return {
+            "encoding_method": "Metatron's Cube Quantum Encoding",
+            "security_level": security_level,
+            "tier": self.security_levels[security_level],
+            "golden_ratio": self.golden_ratio,
+            "phi_harmonic": self.phi_harmonic,
+            "consciousness_level": self.consciousness_threshold,
+            "timestamp": datetime.now().isoformat()
+        }
+    
+    def encode_payload(self, data: Union[str, bytes], security_level: int,
+                       out: Optional[np.ndarray] = None, precision: str = 'float32') -> EncodedPayload:
+        """Encode data into a compact EncodedPayload without the legacy dict form
         
-        for vector in vectors:
-            scaled_amplitude = vector['amplitude'] * self.golden_ratio
-            golden_phase = vector['phase'] * self.golden_ratio
+        ``out`` is an optional preallocated record buffer (e.g. from a
+        BufferPool) of at least one record per input byte; the returned
+        payload is then a view of its leading records. ``precision``
+        selects float64, float32 or float16 columns.
+        """
+        self._validate_security_level(security_level)
+        return self._encode_block(data, security_level, out=out, precision=precision)
+    
+    def encode_stream(self, chunks: Iterable[bytes], security_level: int, chunk_size: int = 1 << 20,
+                      precision: str = 'float32') -> Iterator[EncodedPayload]:
+        """Encode a stream of byte chunks as fixed-size EncodedPayload blocks
+        
+        Incoming chunks are re-cut into blocks of ``chunk_size`` bytes, so
+        peak memory depends on the chunk size and not on the input size.
+        Global vector indices and vertex assignments run on across block
+        boundaries: concatenating the yielded blocks gives the same records
+        as encoding the whole input in one call.
+        """
+        self._validate_security_level(security_level)
+        precision = _precision_name(precision)
+        if chunk_size <= 0:
+            raise ValueError(f"Invalid chunk size: {chunk_size}")
+        
+        pending = bytearray()
+        start = 0
+        
+        for chunk in chunks:
+            view = memoryview(chunk).cast('B')
             
-            scaled_vectors.append({
-                **vector,
-                'scaled_amplitude': scaled_amplitude,
-                'golden_phase': golden_phase,
-                'golden_ratio_applied': True
-            })
+            # Emit every full block this chunk completes
+            while len(pending) + len(view) >= chunk_size:
+                take = chunk_size - len(pending)
+                if pending:
+                    pending += view[:take]
+                    block = bytes(pending)
+                    pending = bytearray()
+                else:
+                    block = view[:take]
+                
+                yield self._encode_block(block, security_level, start, precision=precision)
+                start += chunk_size
+                view = view[take:]
+            
+            pending += view
         
-        return scaled_vectors
+        # Flush the final partial block
+        if pending:
+            yield self._encode_block(bytes(pending), security_level, start, precision=precision)
     
-    def _apply_security_phase(self, vectors: List[Dict], security_level: int) -> List[Dict]:
-        """Apply security-level specific phase shifts"""
-        phase_shifted = []
-        
-        # Different phase shifts based on security level
-        phase_multipliers = {
-            65: pi/4,    # Free/Public
-            99: pi/2,     # Business
-            100: pi,      # Government
-            1000: 2*pi    # Architect
+    def encode_many(self, payloads: Iterable[Union[str, bytes]], security_level: int,
+                    precision: str = 'float32') -> EncodedBatch:
+        """Encode many small payloads in one pass
+        
+        Payloads are concatenated into one buffer and encoded with a single
+        table gather; geometry, recovery key and metadata are shared by the
+        whole batch instead of being rebuilt per payload.
+        """
+        self._validate_security_level(security_level)
+        
+        chunks = [item.encode('utf-8') if isinstance(item, str) else bytes(item) for item in payloads]
+        lengths = np.fromiter((len(chunk) for chunk in chunks), dtype=np.int64, count=len(chunks))
+        offsets = np.zeros(len(chunks) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        
+        payload = self._encode_block(b''.join(chunks), security_level, precision=precision)
+        
+        # Restart vertex assignment at every item boundary: the gather numbered
+        # vertices from the batch start, so shift each item back by its offset
+        # in place, with uint8 temporaries only
+        vertices = payload.vectors['vertex']
+        vertices += np.repeat((12 - offsets[:-1] % 12).astype(np.uint8), lengths)
+        np.subtract(vertices, 12, out=vertices, where=vertices >= 12)
+        
+        return EncodedBatch(
+            payload,
+            offsets,
+            self._build_metadata(security_level),
+            self._generate_recovery_key(security_level)
+        )
+    
+    def persist_state(self, key: str, encoded: Union[Dict, EncodedPayload], store) -> Dict:
+        """Spill an encoding to an on-disk store and track it in quantum_states
+        
+        ``store`` is an EncodedStateStore (qsn_state_store) or anything with
+        the same ``put``/``read`` interface. Returns the store's block index.
+        """
+        payload = self._find_payload(encoded)
+        if payload is None:
+            raise ValueError("persist_state needs a compact encoding or metatrons_cube_encoding result")
+        
+        index = store.put(key, payload)
+        self.quantum_states[key] = {
+            'store': store,
+            'security_level': payload.security_level,
+            'total_vectors': len(payload),
+            'persisted_at': datetime.now().isoformat()
         }
         
-        phase_multiplier = phase_multipliers.get(security_level, pi/4)
+        return index
+    
+    def load_state(self, key: str, start: int = 0, stop: Optional[int] = None) -> EncodedPayload:
+        """Read vectors ``start:stop`` of a persisted state back from its store"""
+        if key not in self.quantum_states:
+            raise KeyError(f"Unknown quantum state: {key}")
+        return self.quantum_states[key]['store'].read(key, start, stop)
+    
+    def reencode_delta(self, previous_encoded: Union[Dict, EncodedPayload], old_bytes: Union[str, bytes],
+                       new_bytes: Union[str, bytes], in_place: bool = False) -> Union[Dict, EncodedPayload]:
+        """Update an encoding of ``old_bytes`` into an encoding of ``new_bytes``
+        
+        Only changed bytes are re-encoded. For equal lengths the differing
+        positions are patched (in ``previous_encoded`` itself when
+        ``in_place`` and its records are writeable or file-backed, as
+        encode_file results are); otherwise the common prefix and suffix
+        records are reused and the suffix's vertices are shifted to their
+        new indices. Returns the same form as given.
+        
+        A file-backed encoding is never copied into memory: it can only be
+        patched ``in_place`` with an equal-length edit, which writes just
+        the changed rows to its file; anything else raises ValueError.
+        """
+        previous = self._find_payload(previous_encoded)
+        if previous is None:
+            raise ValueError("reencode_delta needs a compact encoding or metatrons_cube_encoding result")
+        
+        old_values = self._to_byte_array(old_bytes)
+        new_values = self._to_byte_array(new_bytes)
+        if len(old_values) != len(previous):
+            raise ValueError("old_bytes does not match the previous encoding")
+        
+        security_level = previous.security_level
+        table = self._level_table(security_level, previous.precision)
+        
+        backing = _file_backing(previous.vectors)
+        if backing is not None and not (in_place and len(old_values) == len(new_values)):
+            raise ValueError("reencode_delta would copy a file-backed encoding into memory; "
+                             "patch equal-length edits in_place or re-encode the file with encode_file")
         
-        for vector in vectors:
-            security_phase = vector['golden_phase'] * phase_multiplier
+        if len(old_values) == len(new_values):
+            if in_place and previous.vectors.flags.writeable:
+                records = previous.vectors
+            elif in_place and backing is not None:
+                records = _writable_file_view(previous.vectors, backing)
+            else:
+                records = previous.vectors.copy()  # Shared read-only records (e.g. cached) are never patched
+            changed = self._changed_positions(old_values, new_values)
             
-            phase_shifted.append({
-                **vector,
-                'security_phase': security_phase,
-                'security_level': security_level,
-                'phase_multiplier': phase_multiplier
-            })
+            # Vertices depend only on position, so only the table columns change
+            patched = table[new_values[changed]]
+            patched['vertex'] = records['vertex'][changed]
+            records[changed] = patched
+            if isinstance(records, np.memmap):
+                records.flush()
+        else:
+            prefix = self._common_prefix(old_values, new_values)
+            limit = min(len(old_values), len(new_values)) - prefix
+            suffix = self._common_prefix(old_values[::-1][:limit], new_values[::-1][:limit])
+            
+            new_stop = len(new_values) - suffix
+            records = np.empty(len(new_values), dtype=previous.vectors.dtype)
+            records[:prefix] = previous.vectors[:prefix]
+            _gather_records(table, new_values[prefix:new_stop], records[prefix:new_stop], previous.start + prefix)
+            records[new_stop:] = previous.vectors[len(old_values) - suffix:]
+            
+            # Insertions and deletions move the suffix to new indices
+            if (len(new_values) - len(old_values)) % 12:
+                _assign_vertices(records[new_stop:], previous.start + new_stop)
+        
+        payload = EncodedPayload(records, security_level, previous.start)
+        if isinstance(previous_encoded, EncodedPayload):
+            return payload
+        return self._build_result(payload)
+    
+    @staticmethod
+    def _changed_positions(first: np.ndarray, second: np.ndarray, block_size: int = 1 << 20) -> np.ndarray:
+        """Positions where two equal-length arrays differ, compared block by block"""
+        changed = []
+        for block_start in range(0, len(first), block_size):
+            block_stop = block_start + block_size
+            changed.append(np.flatnonzero(first[block_start:block_stop] != second[block_start:block_stop]) + block_start)
+        return np.concatenate(changed) if changed else np.empty(0, dtype=np.intp)
+    
+    @staticmethod
+    def _common_prefix(first: np.ndarray, second: np.ndarray, block_size: int = 1 << 16) -> int:
+        """Length of the common prefix, compared block by block so it stops early"""
+        length = min(len(first), len(second))
+        
+        for block_start in range(0, length, block_size):
+            block_stop = min(block_start + block_size, length)
+            mismatches = np.flatnonzero(first[block_start:block_stop] != second[block_start:block_stop])
+            if len(mismatches):
+                return block_start + int(mismatches[0])
         
-        return phase_shifted
+        return length
     
-    def _map_to_metatrons_cube(self, vectors: List[Dict]) -> Dict:
+    def decode(self, encoded: Union[Dict, Mapping, EncodedPayload]) -> bytes:
+        """Recover the original bytes of an encoding
+        
+        Accepts an EncodedPayload, a metatrons_cube_encoding result (lazy
+        or materialized) or a bare vector_mapping. Bytes are rebuilt from
+        the amplitude column in one vectorized pass and cross-checked
+        against the phase column.
+        """
+        amplitudes, phases = self._decode_columns(encoded)
+        
+        byte_values = np.rint(amplitudes * 255.0)
+        if not np.array_equal(byte_values, np.rint(phases * (128 / pi))):
+            raise ValueError("Encoded amplitude and phase columns disagree")
+        
+        return byte_values.astype(np.uint8).tobytes()
+    
+    def verify(self, encoded: Union[Dict, Mapping, EncodedPayload], data: Union[str, bytes]) -> bool:
+        """Check that an encoding decodes to ``data`` without building Python objects"""
+        expected = self._to_byte_array(data)
+        payload = self._find_payload(encoded)
+        
+        if payload is not None:
+            return len(payload) == len(expected) and np.array_equal(payload.byte_values, expected)
+        
+        try:
+            decoded = self.decode(encoded)
+        except ValueError:
+            return False
+        return decoded == expected.tobytes()
+    
+    def _find_payload(self, encoded: Union[Dict, Mapping, EncodedPayload]) -> Optional[EncodedPayload]:
+        """Return the EncodedPayload behind an encoding, if it has one"""
+        if isinstance(encoded, EncodedPayload):
+            return encoded
+        if isinstance(encoded, VectorMappingView):
+            return encoded.payload
+        if isinstance(encoded, Mapping) and 'quantum_data' in encoded:
+            return self._find_payload(encoded['quantum_data']['vector_mapping'])
+        return None
+    
+    def _decode_columns(self, encoded: Union[Dict, Mapping, EncodedPayload]) -> Tuple[np.ndarray, np.ndarray]:
+        """Extract float64 amplitude and phase columns in vector index order"""
+        payload = self._find_payload(encoded)
+        if payload is not None:
+            return payload['amplitude'].astype(np.float64), payload['phase'].astype(np.float64)
+        
+        # Legacy dict form: a result dict or a bare vector_mapping
+        vector_mapping = encoded['quantum_data']['vector_mapping'] if 'quantum_data' in encoded else encoded
+        vectors = [entry['original_vector'] for entry in vector_mapping.values()]
+        
+        count = len(vectors)
+        indices = np.fromiter((vector['index'] for vector in vectors), dtype=np.int64, count=count)
+        amplitudes = np.fromiter((vector['amplitude'] for vector in vectors), dtype=np.float64, count=count)
+        phases = np.fromiter((vector['phase'] for vector in vectors), dtype=np.float64, count=count)
+        
+        order = np.argsort(indices, kind='stable')
+        return amplitudes[order], phases[order]
+    
+    def _validate_security_level(self, security_level: int) -> None:
+        """Validate security level"""
+        if security_level not in self.security_levels:
+            raise ValueError(f"Invalid security level: {security_level}")
+    
+    def _encode_block(self, data: Union[str, bytes, memoryview], security_level: int, start: int = 0,
+                      out: Optional[np.ndarray] = None, precision: str = 'float32') -> EncodedPayload:
+        """Encode one block whose first vector is ``start`` by table gather"""
+        byte_values = self._to_byte_array(data)
+        length = len(byte_values)
+        table = self._level_table(security_level, precision)
+        
+        if out is not None:
+            if out.dtype != table.dtype or len(out) < length or not out.flags.c_contiguous or not out.flags.writeable:
+                raise ValueError(f"out must be a writeable contiguous {table.dtype} buffer of at least {length} records")
+            payload = EncodedPayload(out[:length], security_level, start)
+        elif self.max_workers > 1 and length and length >= self.parallel_threshold:
+            return self._encode_parallel(byte_values, security_level, start, table)
+        else:
+            payload = EncodedPayload(np.empty(length, dtype=table.dtype), security_level, start)
+        
+        _gather_records(table, byte_values, payload.vectors, start, self._index_buffer(length))
+        
+        return payload
+    
+    def _level_table(self, security_level: int, precision: str = 'float32') -> np.ndarray:
+        """Lookup table of a security level at a column precision"""
+        return self.precision_tables[_precision_name(precision)][security_level]
+    
+    @property
+    def pipeline(self) -> EncodingPipeline:
+        """The stages the encoder's lookup tables are built from
+        
+        Assigning a pipeline, or editing this one, rebuilds the tables on
+        the spot; a pipeline the tables cannot be built from is refused
+        with ValueError and the previous tables stay in use.
+        """
+        return self._pipeline
+    
+    @pipeline.setter
+    def pipeline(self, pipeline: EncodingPipeline) -> None:
+        with self._tables_lock:
+            self._rebuild_tables(pipeline)
+            if self._pipeline is not None:
+                self._pipeline.unsubscribe(self._pipeline_changed)
+            pipeline.subscribe(self._pipeline_changed)
+            self._pipeline = pipeline
+    
+    def _pipeline_changed(self, pipeline: EncodingPipeline) -> None:
+        with self._tables_lock:
+            if pipeline is self._pipeline:
+                self._rebuild_tables(pipeline)
+    
+    def _rebuild_tables(self, pipeline: EncodingPipeline) -> None:
+        """Rebuild every precision's level tables from ``pipeline``
+        
+        Called with _tables_lock held. Nothing is replaced unless every
+        table builds, and the new tables are swapped in whole, so
+        concurrent encodes see either the old or the new set. Cached
+        encodings made with the old stages are dropped.
+        """
+        precision_tables = {
+            precision: self._build_level_tables(float_dtype, pipeline)
+            for precision, float_dtype in PRECISIONS.items()
+        }
+        legacy_tables = self._build_legacy_tables(pipeline)
+        self.legacy_tables = legacy_tables
+        self.precision_tables = precision_tables
+        self.level_tables = precision_tables['float32']
+        
+        if self.encoding_cache is not None:
+            self.encoding_cache.clear()
+    
+    def _index_buffer(self, length: int) -> Optional[np.ndarray]:
+        """This thread's reusable intp index scratch, for blocks up to SCRATCH_LIMIT"""
+        if length > self.SCRATCH_LIMIT:
+            return None
+        
+        indices = getattr(self._scratch, 'indices', None)
+        if indices is None:
+            indices = self._scratch.indices = np.empty(self.SCRATCH_LIMIT, dtype=np.intp)
+        return indices
+    
+    def _encode_parallel(self, byte_values: np.ndarray, security_level: int, start: int,
+                         table: np.ndarray) -> EncodedPayload:
+        """Encode a large buffer in shards across a process pool
+        
+        Input bytes and output records live in shared memory, so workers
+        only receive segment names and shard bounds and write their records
+        in place with the correct global indices and vertices. The returned
+        payload's records stay in the output segment rather than being
+        copied out; it is unmapped once the last view of them is gone.
+        
+        Workers are started with forkserver (spawn where unavailable), never
+        fork, so this is safe to call while other threads share the core.
+        """
+        length = len(byte_values)
+        
+        # A few shards per worker keeps the pool busy when shards finish unevenly
+        shard_count = self.max_workers * 4
+        bounds = np.linspace(0, length, shard_count + 1, dtype=np.int64).tolist()
+        
+        input_shm = SharedMemory(create=True, size=length)
+        output_shm = SharedMemory(create=True, size=length * table.itemsize)
+        try:
+            np.ndarray(length, dtype=np.uint8, buffer=input_shm.buf)[:] = byte_values
+            
+            with ProcessPoolExecutor(max_workers=self.max_workers, mp_context=_pool_context()) as executor:
+                shards = [
+                    executor.submit(
+                        _encode_shard, input_shm.name, output_shm.name, table,
+                        length, shard_start, shard_stop, start
+                    )
+                    for shard_start, shard_stop in zip(bounds[:-1], bounds[1:])
+                    if shard_stop > shard_start
+                ]
+                for shard in shards:
+                    shard.result()
+        except BaseException:
+            output_shm.close()
+            output_shm.unlink()
+            raise
+        finally:
+            input_shm.close()
+            input_shm.unlink()
+        
+        # Drop the segment's name now; the mapping itself lives as long as the records
+        records = np.ndarray(length, dtype=table.dtype, buffer=output_shm.buf)
+        output_shm.unlink()
+        weakref.finalize(records, output_shm.close)
+        
+        return EncodedPayload(records, security_level, start)
+    
+    def default_pipeline(self) -> EncodingPipeline:
+        """The built-in per-vector encoding stages as an editable pipeline"""
+        return EncodingPipeline([
+            EncodingStage(
+                'quantum_vectors',
+                lambda columns, security_level: {**columns, **self._text_to_quantum_vectors(columns['byte_value'])}
+            ),
+            EncodingStage('golden_ratio', lambda columns, security_level: self._apply_golden_ratio(columns)),
+            EncodingStage('security_phase', self._apply_security_phase),
+            EncodingStage(
+                'metatrons_cube',
+                lambda columns, security_level: {**columns, 'vertex': (columns['index'] % 12).astype(np.uint8)},
+                positional=True
+            )
+        ])
+    
+    def encode_pipeline(self, data: Union[str, bytes], security_level: int,
+                        pipeline: Optional[EncodingPipeline] = None) -> Tuple[Dict[str, np.ndarray], Dict[str, float]]:
+        """Run an encoding pipeline (default: ``self.pipeline``) over data
+        
+        Returns the encoded columns and the per-stage timings reported by
+        the planner, so custom stages can be measured in place.
+        """
+        self._validate_security_level(security_level)
+        return (pipeline or self.pipeline).run(data, security_level)
+    
+    def _build_level_tables(self, float_dtype=np.float32,
+                            pipeline: Optional[EncodingPipeline] = None) -> Dict[int, np.ndarray]:
+        """Precompute the 256-row encoded record table of every security level
+        
+        Every encoded column is a pure function of (byte value, security
+        level): the pipeline's planner fuses those stages into one 256-row
+        table per level and encoding becomes a single gather per byte.
+        Vertices are assigned positionally by the encoder, so the only
+        stage allowed outside the table run is ``metatrons_cube``; other
+        custom stages need encode_pipeline. Tables are read-only, so worker
+        processes share them safely.
+        """
+        pipeline = pipeline or self.default_pipeline()
+        groups = pipeline.plan()
+        table_stages = groups[0][1] if groups and groups[0][0] == 'table' else []
+        unfusable = [stage.name for stage in pipeline.stages if stage not in table_stages and stage.name != 'metatrons_cube']
+        if unfusable:
+            raise ValueError(f"Stages {unfusable} cannot be fused into the encoder's lookup tables; use encode_pipeline")
+        
+        tables = {}
+        for security_level in self.security_levels:
+            table = EncodedPayload.empty(256, security_level, float_dtype=float_dtype).vectors
+            try:
+                columns = pipeline.lookup_table(security_level)
+            except Exception as error:
+                raise ValueError(f"Pipeline failed to build the level {security_level} lookup table: {error!r}") from error
+            for field in ('amplitude', 'phase', 'golden_phase', 'security_phase'):
+                if field not in columns:
+                    raise ValueError(f"Pipeline does not produce the {field!r} column")
+                table[field] = columns[field]
+            table['vertex'] = 0
+            table.flags.writeable = False
+            tables[security_level] = table
+        
+        return tables
+    
+    # float64 columns of the legacy ``original_vector`` entries
+    LEGACY_FIELDS = ('amplitude', 'phase', 'scaled_amplitude', 'golden_phase', 'security_phase')
+    
+    def _build_legacy_tables(self, pipeline: EncodingPipeline) -> Dict[int, np.ndarray]:
+        """256 x LEGACY_FIELDS float64 table per level, from the pipeline's fused stages
+        
+        The legacy ``vector_{i}`` view renders from these, so it always
+        shows the values the pipeline encodes, at full precision.
+        """
+        tables = {}
+        for security_level in self.security_levels:
+            columns = pipeline.lookup_table(security_level)
+            missing = [field for field in self.LEGACY_FIELDS if field not in columns]
+            if missing:
+                raise ValueError(f"Pipeline does not produce the {missing} columns")
+            
+            table = np.empty((256, len(self.LEGACY_FIELDS)), dtype=np.float64)
+            for position, field in enumerate(self.LEGACY_FIELDS):
+                table[:, position] = columns[field]
+            if not np.array_equal(np.rint(table[:, 0] * 255.0), np.arange(256)):
+                raise ValueError("Pipeline changes the amplitude column, which decoding recovers bytes from")
+            table.flags.writeable = False
+            tables[security_level] = table
+        
+        return tables
+    
+    @staticmethod
+    def _to_byte_array(data: Union[str, bytes, memoryview]) -> np.ndarray:
+        """View str (as UTF-8) or bytes-like data as a uint8 array"""
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        return np.frombuffer(data, dtype=np.uint8)
+    
+    def _text_to_quantum_vectors(self, text: Union[str, bytes, memoryview]) -> Dict[str, np.ndarray]:
+        """Convert text to quantum state vectors (one array column per field)"""
+        byte_values = self._to_byte_array(text)
+        
+        return {
+            'byte_value': byte_values,
+            'amplitude': byte_values / 255.0,
+            'phase': (byte_values * pi) / 128
+        }
+    
+    def _apply_golden_ratio(self, vectors: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """Apply golden ratio scaling to quantum vectors"""
+        return {
+            **vectors,
+            'scaled_amplitude': vectors['amplitude'] * self.golden_ratio,
+            'golden_phase': vectors['phase'] * self.golden_ratio
+        }
+    
+    def _apply_security_phase(self, vectors: Dict[str, np.ndarray], security_level: int) -> Dict[str, np.ndarray]:
+        """Apply security-level specific phase shifts"""
+        
+        phase_multiplier = self._get_phase_multiplier(security_level)
+        
+        return {
+            **vectors,
+            'security_phase': vectors['golden_phase'] * phase_multiplier
+        }
+    
+    def _get_phase_multiplier(self, security_level: int) -> float:
+        """Get the security phase multiplier for a security level"""
+        return self.PHASE_MULTIPLIERS.get(security_level, pi/4)
+    
+    def _map_to_metatrons_cube(self, payload: EncodedPayload) -> Dict:
         """Map quantum vectors to Metatron's Cube geometry"""
+        return {
+            'geometry': self.cube_geometry,
+            'vector_mapping': VectorMappingView(self, payload, self.cube_geometry),
+            'total_vertices': 13,
+            'total_vectors': len(payload)
+        }
+    
+    def _build_cube_geometry(self) -> Dict:
+        """Build the static Metatron's Cube vertex geometry"""
         cube_geometry = {
             'center': {'position': [0, 0, 0], 'quantum_phase': 0},
             'outer_ring': []
@@ -165,25 +1688,50 @@ class QSNQuantumCore:
                 'golden_ratio_alignment': self.golden_ratio
             })
         
-        # Map vectors to vertices
+        return cube_geometry
+    
+    def render_vector_mapping(self, payload: EncodedPayload, cube_geometry: Dict) -> Dict:
+        """Render the legacy ``vector_{i}`` dict form of an EncodedPayload"""
+        outer_ring = cube_geometry['outer_ring']
+        security_level = payload.security_level
+        phase_multiplier = self._get_phase_multiplier(security_level)
+        
+        # Look the float64 legacy values up from the exactly recovered bytes
+        byte_values = payload.byte_values
+        legacy = np.take(self.legacy_tables[security_level], byte_values, axis=0)
+        
+        # Pull every column out of NumPy in one pass per column
+        columns = zip(
+            payload.indices.tolist(),
+            byte_values.tolist(),
+            *(legacy[:, position].tolist() for position in range(len(self.LEGACY_FIELDS))),
+            payload['vertex'].tolist()
+        )
+        
         vector_mapping = {}
-        for i, vector in enumerate(vectors):
-            vertex_idx = i % 12
-            vertex = cube_geometry['outer_ring'][vertex_idx]
+        for i, byte_val, amplitude, phase, scaled_amplitude, golden_phase, security_phase, vertex_idx in columns:
+            vertex = outer_ring[vertex_idx]
             
             vector_mapping[f'vector_{i}'] = {
-                'original_vector': vector,
+                'original_vector': {
+                    'index': i,
+                    'amplitude': amplitude,
+                    'phase': phase,
+                    'byte_value': byte_val,
+                    'quantum_state': f"|ψ⟩_{i} = {amplitude:.4f} + {phase:.4f}i",
+                    'scaled_amplitude': scaled_amplitude,
+                    'golden_phase': golden_phase,
+                    'golden_ratio_applied': True,
+                    'security_phase': security_phase,
+                    'security_level': security_level,
+                    'phase_multiplier': phase_multiplier
+                },
                 'vertex_assignment': vertex_idx,
                 'geometric_position': vertex['position'],
                 'vertex_phase': vertex['quantum_phase']
             }
         
-        return {
-            'geometry': cube_geometry,
-            'vector_mapping': vector_mapping,
-            'total_vertices': 13,
-            'total_vectors': len(vectors)
-        }
+        return vector_mapping
     
     def _apply_consciousness_alignment(self, cube_mapping: Dict) -> Dict:
         """Apply consciousness threshold alignment"""
@@ -200,6 +1748,12 @@ class QSNQuantumCore:
     
     def _generate_recovery_key(self, security_level: int) -> Dict:
         """Generate quantum recovery key"""
+        if security_level in self.recovery_keys:
+            return self.recovery_keys[security_level]
+        return _freeze(self._build_recovery_key(security_level))
+    
+    def _build_recovery_key(self, security_level: int) -> Dict:
+        """Build the recovery key of a security level from the core constants"""
         key_components = {
             'golden_ratio': self.golden_ratio,
             'phi_harmonic': self.phi_harmonic,
@@ -220,26 +1774,7 @@ class QSNQuantumCore:
     
     def _get_recovery_protocol(self, security_level: int) -> Dict:
         """Get recovery protocol based on security level"""
-        protocols = {
-            65: {
-                'steps': ['Golden ratio alignment', 'Basic phase correction'],
-                'requirements': ['Standard quantum resonator']
-            },
-            99: {
-                'steps': ['Golden ratio alignment', 'Advanced phase correction', 'Consciousness verification'],
-                'requirements': ['Enhanced quantum resonator', 'Consciousness monitor']
-            },
-            100: {
-                'steps': ['Golden ratio alignment', 'Government phase protocol', 'Temporal verification', 'Strata security check'],
-                'requirements': ['Military-grade quantum resonator', 'Temporal monitor', 'Strata security system']
-            },
-            1000: {
-                'steps': ['Developer-level quantum alignment', 'Multi-dimensional phase correction', 'Full consciousness integration', 'Temporal and strata verification'],
-                'requirements': ['Developer-grade quantum system', 'Full consciousness management', 'Advanced temporal monitoring']
-            }
-        }
-        
-        return protocols.get(security_level, protocols[65])
+        return self.RECOVERY_PROTOCOLS.get(security_level, self.RECOVERY_PROTOCOLS[65])
     
     def add_temporal_warning(self, warning: str, severity: str = "medium") -> None:
         """Add temporal security warning"""
@@ -249,6 +1784,7 @@ class QSNQuantumCore:
             'timestamp': datetime.now().isoformat(),
             'consciousness_level': self.consciousness_threshold
         })
+        self._publish_status()
     
     def add_strata_security(self, level: int, security_data: Dict) -> None:
         """Add strata security layer"""
@@ -257,19 +1793,41 @@ class QSNQuantumCore:
             'applied_at': datetime.now().isoformat(),
             'quantum_protected': True
         }
+        self._publish_status()
     
     def get_system_status(self) -> Dict:
         """Get complete QSN system status"""
+        status = self._status
         return {
+            **status,
+            'temporal_warnings_by_severity': dict(status['temporal_warnings_by_severity']),
+            'security_levels_supported': list(status['security_levels_supported'])
+        }
+    
+    def _publish_status(self) -> None:
+        """Rebuild the status snapshot and swap it in
+        
+        Rebuilding under the lock means the last snapshot published always
+        reflects every write that completed before it.
+        """
+        with self._status_lock:
+            self._status = self._build_status()
+    
+    def _build_status(self) -> Dict:
+        held, total_recorded, by_severity = self.temporal_warnings.severity_snapshot()
+        
+        return _freeze({
             'system_name': 'QSN Quantum Security Network',
             'development_level': 1000,
             'quantum_encoding': 'Metatron\'s Cube',
             'consciousness_management': f"{self.consciousness_threshold}% optimal",
-            'temporal_warnings': len(self.temporal_warnings),
+            'temporal_warnings': held,
+            'temporal_warnings_recorded': total_recorded,
+            'temporal_warnings_by_severity': by_severity,
             'strata_security_layers': len(self.strata_security),
             'security_levels_supported': list(self.security_levels.keys()),
             'system_health': 'OPERATIONAL'
-        }
+        })
 
 # Example usage
 if __name__ == "__main__":
@@ -0,0 +1,161 @@
+"""
+QSN-CORE: Encoded State Store
+Block-compressed, randomly accessible on-disk storage for encoded payloads
+"""
+
+import json
+import lzma
+import os
+import re
+import struct
+import zlib
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from qsn_quantum_core import EncodedPayload
+
+
+class EncodedStateStore:
+    """Persistent store of EncodedPayloads in independently compressed blocks
+
+    Each key is one ``<key>.qsnb`` file: a run of compressed blocks of
+    ``block_records`` records, followed by a JSON block index, its length
+    and a magic trailer. Within a block the records are stored column by
+    column, which compresses far better than interleaved records. Reading
+    a range of vectors only decompresses the blocks that overlap it.
+    """
+
+    MAGIC = b'QSNBLK01'
+    CODECS = {
+        'zlib': (lambda data, level: zlib.compress(data, level), zlib.decompress),
+        'lzma': (lambda data, level: lzma.compress(data, preset=level), lzma.decompress)
+    }
+
+    def __init__(self, directory: str, block_records: int = 1 << 16, codec: str = 'zlib', level: int = 6):
+        if codec not in self.CODECS:
+            raise ValueError(f"Unsupported codec: {codec}")
+        if block_records <= 0:
+            raise ValueError(f"Invalid block size: {block_records}")
+
+        self.directory = directory
+        self.block_records = block_records
+        self.codec = codec
+        self.level = level
+        self._indexes: Dict[str, Dict] = {}
+
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        if not re.fullmatch(r'[A-Za-z0-9_.-]+', key) or key.startswith('.'):
+            raise ValueError(f"Invalid state key: {key}")
+        return os.path.join(self.directory, f"{key}.qsnb")
+
+    def put(self, key: str, payload: EncodedPayload) -> Dict:
+        """Write a payload block by block; returns its block index"""
+        compress = self.CODECS[self.codec][0]
+        vectors = payload.vectors
+        blocks: List[List[int]] = []
+
+        path = self._path(key)
+        with open(f"{path}.tmp", 'wb') as out:
+            for block_start in range(0, len(vectors), self.block_records):
+                block = vectors[block_start:block_start + self.block_records]
+                raw = b''.join(np.ascontiguousarray(block[field]).tobytes() for field in vectors.dtype.names)
+                compressed = compress(raw, self.level)
+
+                blocks.append([out.tell(), len(compressed)])
+                out.write(compressed)
+
+            index = {
+                'security_level': payload.security_level,
+                'start': payload.start,
+                'dtype': [[name, vectors.dtype[name].str] for name in vectors.dtype.names],
+                'records': len(vectors),
+                'block_records': self.block_records,
+                'codec': self.codec,
+                'blocks': blocks
+            }
+            encoded_index = json.dumps(index).encode('utf-8')
+            out.write(encoded_index)
+            out.write(struct.pack('<Q', len(encoded_index)))
+            out.write(self.MAGIC)
+
+        os.replace(f"{path}.tmp", path)
+        self._indexes[key] = index
+        return index
+
+    def info(self, key: str) -> Dict:
+        """Block index of a stored payload"""
+        if key not in self._indexes:
+            with open(self._path(key), 'rb') as source:
+                source.seek(-(8 + len(self.MAGIC)), os.SEEK_END)
+                index_length, magic = struct.unpack('<Q', source.read(8))[0], source.read(len(self.MAGIC))
+                if magic != self.MAGIC:
+                    raise ValueError(f"Not an encoded state file: {key}")
+
+                source.seek(-(8 + len(self.MAGIC) + index_length), os.SEEK_END)
+                self._indexes[key] = json.loads(source.read(index_length))
+
+        return self._indexes[key]
+
+    def read(self, key: str, start: int = 0, stop: Optional[int] = None) -> EncodedPayload:
+        """Read records ``start:stop`` (positions within the stored payload)"""
+        index = self.info(key)
+        records = index['records']
+        start, stop, _ = slice(start, stop).indices(records)
+        stop = max(start, stop)
+
+        dtype = np.dtype([tuple(field) for field in index['dtype']])
+        decompress = self.CODECS[index['codec']][1]
+        block_records = index['block_records']
+        vectors = np.empty(stop - start, dtype=dtype)
+
+        first_block = start // block_records
+        last_block = (stop - 1) // block_records if stop > start else first_block - 1
+
+        with open(self._path(key), 'rb') as source:
+            for block_number in range(first_block, last_block + 1):
+                offset, length = index['blocks'][block_number]
+                source.seek(offset)
+                raw = decompress(source.read(length))
+
+                block_start = block_number * block_records
+                block = np.empty(min(block_records, records - block_start), dtype=dtype)
+                column_offset = 0
+                for name in dtype.names:
+                    column_bytes = len(block) * dtype[name].itemsize
+                    block[name] = np.frombuffer(raw, dtype=dtype[name], count=len(block), offset=column_offset)
+                    column_offset += column_bytes
+
+                # Copy the overlap of this block with the requested range
+                low = max(start, block_start)
+                high = min(stop, block_start + len(block))
+                vectors[low - start:high - start] = block[low - block_start:high - block_start]
+
+        return EncodedPayload(vectors, index['security_level'], index['start'] + start)
+
+    def __contains__(self, key: str) -> bool:
+        return os.path.exists(self._path(key))
+
+    def keys(self) -> List[str]:
+        return sorted(name[:-len('.qsnb')] for name in os.listdir(self.directory) if name.endswith('.qsnb'))
+
+    def delete(self, key: str) -> None:
+        os.remove(self._path(key))
+        self._indexes.pop(key, None)
+
+
+# Example usage
+if __name__ == "__main__":
+    from qsn_quantum_core import QSNQuantumCore
+
+    qsn_core = QSNQuantumCore()
+    store = EncodedStateStore("qsn_state")
+
+    encoded = qsn_core.metatrons_cube_encoding("Quantum Security Network Test Data" * 1000, 99)
+    info = qsn_core.persist_state("example", encoded, store)
+    print(f"Stored {info['records']} vectors in {len(info['blocks'])} blocks")
+
+    window = qsn_core.load_state("example", 100, 110)
+    print(f"Vectors 100-110 decode to: {qsn_core.decode(window)!r}")
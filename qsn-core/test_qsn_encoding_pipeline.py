@@ -0,0 +1,79 @@
+"""
+QSN-CORE: Encoding pipeline tests
+Edits to a core's pipeline take effect, or are refused, at the edit itself
+"""
+
+import numpy as np
+import pytest
+
+from qsn_quantum_core import EncodingStage, QSNQuantumCore
+
+
+def _boost(columns, security_level):
+    return {**columns, 'security_phase': columns['security_phase'] + 100}
+
+
+def test_pipeline_edit_rebuilds_tables():
+    core = QSNQuantumCore()
+    before = core.encode_payload(b"quantum", 65)['security_phase']
+
+    core.pipeline.add(EncodingStage('boost', _boost), after='security_phase')
+    np.testing.assert_allclose(core.encode_payload(b"quantum", 65)['security_phase'], before + 100, rtol=1e-6)
+
+    core.pipeline.remove('boost')
+    np.testing.assert_array_equal(core.encode_payload(b"quantum", 65)['security_phase'], before)
+
+
+@pytest.mark.parametrize('edit', [
+    lambda pipeline: pipeline.remove('golden_ratio'),
+    lambda pipeline: pipeline.add(EncodingStage('late', lambda columns, security_level: columns)),
+    lambda pipeline: pipeline.reorder(['quantum_vectors', 'metatrons_cube']),
+])
+def test_invalid_pipeline_edit_is_refused_and_undone(edit):
+    core = QSNQuantumCore()
+    names, version = core.pipeline.names, core.pipeline.version
+    expected = core.metatrons_cube_encoding("quantum", 99)
+
+    with pytest.raises(ValueError):
+        edit(core.pipeline)
+
+    assert core.pipeline.names == names
+    assert core.pipeline.version == version
+    assert core.decode(core.metatrons_cube_encoding("quantum", 99)) == core.decode(expected) == b"quantum"
+    core.encode_pipeline("quantum", 99)
+
+
+def test_invalid_pipeline_assignment_keeps_previous_tables():
+    core = QSNQuantumCore()
+    pipeline = core.pipeline
+    replacement = core.default_pipeline()
+    replacement.remove('metatrons_cube')
+    replacement.add(EncodingStage('late', lambda columns, security_level: columns, positional=True))
+
+    with pytest.raises(ValueError):
+        core.pipeline = replacement
+
+    assert core.pipeline is pipeline
+    assert core.decode(core.encode_payload(b"quantum", 65)) == b"quantum"
+
+
+def test_legacy_mapping_shows_pipeline_values():
+    core = QSNQuantumCore()
+    core.pipeline.add(EncodingStage('boost', _boost), after='security_phase')
+
+    payload = core.encode_payload(b"quantum", 65)
+    mapping = core.materialize(core.metatrons_cube_encoding("quantum", 65))['quantum_data']['vector_mapping']
+    legacy = [entry['original_vector']['security_phase'] for entry in mapping.values()]
+
+    np.testing.assert_allclose(legacy, payload['security_phase'], rtol=1e-6)
+    assert min(legacy) > 100
+
+
+def test_pipeline_changing_amplitude_is_refused():
+    core = QSNQuantumCore()
+
+    with pytest.raises(ValueError):
+        core.pipeline.add(
+            EncodingStage('dim', lambda columns, security_level: {**columns, 'amplitude': columns['amplitude'] / 2}),
+            after='quantum_vectors'
+        )
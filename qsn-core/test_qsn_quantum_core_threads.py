@@ -0,0 +1,74 @@
+"""
+QSN-CORE: Thread-safety tests
+One QSNQuantumCore shared by many threads must keep its bookkeeping consistent
+"""
+
+import random
+import sys
+import threading
+
+from qsn_quantum_core import QSNQuantumCore
+
+
+THREADS = 64
+ITERATIONS = 100
+SEVERITIES = ('low', 'medium', 'high')
+
+
+def test_shared_core_stays_consistent_under_threads():
+    core = QSNQuantumCore(cache_bytes=1 << 18, warning_capacity=500, strata_capacity=50)
+    rng = random.Random(0)
+    payloads = [bytes(rng.randrange(256) for _ in range(rng.randrange(1, 3000))) for _ in range(40)]
+    levels = list(core.security_levels)
+    errors = []
+
+    def work(thread: int) -> None:
+        try:
+            for iteration in range(ITERATIONS):
+                data = payloads[(thread + iteration) % len(payloads)]
+                payload = core._cached_payload(data, levels[iteration % len(levels)])
+                assert core.decode(payload) == data
+
+                core.add_temporal_warning(f"warning {thread}/{iteration}", SEVERITIES[iteration % 3])
+                core.add_strata_security((thread * ITERATIONS + iteration) % 120, {"thread": thread})
+
+                status = core.get_system_status()
+                assert sum(status['temporal_warnings_by_severity'].values()) == status['temporal_warnings'] <= 500
+                assert status['strata_security_layers'] <= 50
+
+                list(core.temporal_warnings)
+                core.strata_security.between(0, float('inf'))
+                core.encoding_cache.stats()
+        except Exception as error:  # Surface failures from worker threads
+            errors.append(error)
+
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # Force frequent thread switches
+    try:
+        threads = [threading.Thread(target=work, args=(thread,)) for thread in range(THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(switch_interval)
+
+    assert not errors, errors[:3]
+
+    status = core.get_system_status()
+    warnings = core.temporal_warnings
+    assert status['temporal_warnings_recorded'] == warnings.total_recorded == THREADS * ITERATIONS
+    assert status['temporal_warnings'] == len(warnings) == 500
+    assert status['temporal_warnings_by_severity'] == {
+        severity: sum(1 for warning in warnings if warning['severity'] == severity) for severity in SEVERITIES
+    }
+    assert warnings.evicted == THREADS * ITERATIONS - 500
+    assert warnings[-10:] == list(warnings)[-10:]
+
+    strata = core.strata_security
+    assert status['strata_security_layers'] == len(strata) == 50
+    assert strata.total_applied == THREADS * ITERATIONS
+
+    cache = core.encoding_cache
+    assert cache.current_bytes == sum(payload.nbytes for payload in cache._entries.values()) <= cache.max_bytes
+    assert cache.hits + cache.misses == THREADS * ITERATIONS
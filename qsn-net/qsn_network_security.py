@@ -255,6 +255,7 @@ async def main():
     
     # Enable stealth mode
     stealth_result = await qsn_net.enable_stealth_mode(99)
+    stealth_result['quantum_encoded'] = qsn_core.materialize(stealth_result['quantum_encoded'])
     print("\nStealth Mode Activated:")
     print(json.dumps(stealth_result, indent=2))
     